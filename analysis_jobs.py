@@ -0,0 +1,249 @@
+import os
+import time
+import uuid
+import queue
+import hashlib
+import threading
+import logging
+from cache import LRUCache, SQLiteCache, TieredCache
+from finance_analysis import generate_analysis, is_quota_error, get_model, MAX_RETRIES, RETRY_DELAY
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드 분석 작업 수 (Gemini 호출과 재시도 대기는 요청 스레드가 아닌 여기서 처리)
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '2'))
+
+# 분당 Gemini 요청 수 제한 (사용하는 모델/요금제의 RPM에 맞춰 설정)
+# 어느 60초 구간에서도 GEMINI_RPM번을 넘지 않음: 처음 GEMINI_RPM // 4번(최소 1번)까지는 바로 보내고,
+# 이후에는 나머지 요청 수만큼 1분에 걸쳐 고르게 보냄 (예: 15이면 바로 3번 + 분당 12번)
+GEMINI_RPM = int(os.getenv('GEMINI_RPM', '15'))
+
+# 대기열에 쌓을 수 있는 최대 작업 수 (넘으면 기본 분석만 제공)
+MAX_QUEUED_JOBS = int(os.getenv('ANALYSIS_QUEUE_SIZE', '100'))
+
+# 작업 결과 보관 시간 (초)
+JOB_TTL = 60 * 60
+
+# 분석 결과 캐시 (같은 재무 요약 + 같은 모델이면 Gemini를 다시 호출하지 않음)
+ANALYSIS_CACHE_TTL = 30 * 24 * 60 * 60
+analysis_cache = TieredCache(
+    'analysis',
+    LRUCache(maxsize=128),
+    SQLiteCache('dart_cache.db', table='analysis', max_entries=5000)
+)
+
+
+class TokenBucket:
+    """
+    분당 요청 수(rate_per_minute)를 넘지 않도록 요청 간격을 조절하는 토큰 버킷입니다.
+    최대 capacity개까지 모아 짧은 버스트를 허용하고, 토큰은 (rate_per_minute - capacity)개/분 속도로 채워집니다.
+    버스트와 1분 동안 채워지는 토큰의 합이 rate_per_minute이므로 어느 60초 구간에서도 한도를 넘지 않습니다.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.capacity = capacity or max(1, rate_per_minute // 4)
+        if rate_per_minute > 1:
+            # 채우는 속도가 0이 되지 않도록 버스트는 한도보다 작게 제한
+            self.capacity = min(self.capacity, rate_per_minute - 1)
+        self.rate = max(rate_per_minute - self.capacity, 1) / 60.0
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, timeout=None):
+        """
+        토큰 하나를 가져옵니다. 토큰이 없으면 채워질 때까지 기다립니다.
+
+        Returns:
+            토큰을 얻으면 True, timeout 안에 얻지 못하면 False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+            time.sleep(wait_time)
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+
+
+rate_limiter = TokenBucket(GEMINI_RPM)
+
+# 작업 상태: queued(대기열) -> running(분석 중) -> retrying(할당량 초과, 재시도 대기) -> done / failed
+jobs = LRUCache(maxsize=1024)
+_queue = queue.Queue(maxsize=MAX_QUEUED_JOBS)
+_inflight = {}  # 분석 캐시 키 -> 대기 중이거나 실행 중인 작업 (같은 분석 요청 합치기)
+_workers = []
+_running = 0
+_lock = threading.Lock()
+
+
+def update_job(job, **fields):
+    with _lock:
+        job.update(fields)
+        job['updated_at'] = time.time()
+
+
+def get_job(job_id):
+    """
+    작업 상태를 반환합니다. 없거나 만료된 작업이면 None을 반환합니다.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return None
+    with _lock:
+        return dict(job)
+
+
+def queue_stats():
+    """
+    작업 대기열 상태를 반환합니다.
+    """
+    with _lock:
+        stats = {
+            'queued': _queue.qsize(),
+            'running': _running,
+            'in_flight': len(_inflight),
+            'workers': len(_workers),
+            'max_queued': MAX_QUEUED_JOBS,
+        }
+    stats['rpm'] = GEMINI_RPM
+    stats['tokens_available'] = rate_limiter.available()
+    return stats
+
+
+def analysis_cache_key(prompt):
+    """
+    공백을 정규화한 프롬프트와 모델 이름으로 분석 캐시 키를 만듭니다.
+    """
+    normalized = ' '.join(prompt.split())
+    return hashlib.sha256(f"{get_model().model_name}\n{normalized}".encode('utf-8')).hexdigest()
+
+
+def get_cached_analysis(prompt):
+    """
+    같은 프롬프트의 이전 분석 결과를 반환합니다. 없으면 None을 반환합니다.
+    """
+    return analysis_cache.get(analysis_cache_key(prompt), ANALYSIS_CACHE_TTL)
+
+
+def cache_analysis(prompt, analysis):
+    """
+    완료된 분석 결과를 캐시에 저장합니다.
+    """
+    analysis_cache.set(analysis_cache_key(prompt), analysis, ANALYSIS_CACHE_TTL)
+
+
+def _start_workers():
+    # 첫 작업이 들어올 때 워커 스레드 시작 (gunicorn 워커 프로세스마다 따로 시작됨)
+    with _lock:
+        if _workers:
+            return
+        for i in range(ANALYSIS_WORKERS):
+            worker = threading.Thread(target=_worker_loop, name=f'analysis-{i}', daemon=True)
+            worker.start()
+            _workers.append(worker)
+
+
+def submit_analysis(prompt):
+    """
+    AI 분석을 대기열에 등록하고 바로 반환합니다.
+    같은 분석이 이미 대기 중이거나 실행 중이면 새 작업을 만들지 않고 그 작업을 반환합니다.
+
+    Args:
+        prompt: build_analysis_prompt()로 만든 프롬프트
+
+    Returns:
+        작업 상태 딕셔너리 ('id'로 /api/jobs/<id>에서 조회). 대기열이 가득 차면 None
+    """
+    _start_workers()
+    key = analysis_cache_key(prompt)
+
+    with _lock:
+        job = _inflight.get(key)
+        if job is not None:
+            job['coalesced'] += 1
+            return dict(job)
+
+        now = time.time()
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': 'queued',
+            'analysis': None,
+            'error': None,
+            'attempts': 0,
+            'coalesced': 0,
+            'created_at': now,
+            'updated_at': now,
+        }
+        try:
+            _queue.put_nowait((job, prompt, key))
+        except queue.Full:
+            logger.warning("AI 분석 대기열이 가득 찼습니다.")
+            return None
+        _inflight[key] = job
+        jobs.set(job['id'], job, JOB_TTL)
+        return dict(job)
+
+
+def _worker_loop():
+    global _running
+    while True:
+        job, prompt, key = _queue.get()
+        with _lock:
+            _running += 1
+        try:
+            run_analysis(job, prompt)
+        except Exception as e:
+            logger.error(f"AI 분석 작업 오류: {e}")
+            update_job(job, status='failed', error=str(e))
+        finally:
+            with _lock:
+                _running -= 1
+                _inflight.pop(key, None)
+            _queue.task_done()
+
+
+def run_analysis(job, prompt):
+    """
+    Gemini 분석을 실행합니다. 호출마다 분당 요청 수 제한을 지키며, 할당량 초과 시 지수 백오프로 재시도합니다.
+    """
+    for attempt in range(MAX_RETRIES):
+        rate_limiter.acquire()
+        update_job(job, status='running', attempts=attempt + 1)
+        try:
+            analysis = generate_analysis(prompt)
+        except Exception as e:
+            logger.warning(f"AI 분석 시도 {attempt + 1}/{MAX_RETRIES} 실패: {e}")
+
+            if is_quota_error(e) and attempt < MAX_RETRIES - 1:
+                wait_time = RETRY_DELAY * (2 ** attempt)
+                logger.info(f"할당량 초과. {wait_time}초 후 재시도...")
+                update_job(job, status='retrying', error=str(e))
+                time.sleep(wait_time)
+                continue
+
+            logger.error(f"AI 분석 중 오류 발생: {e}")
+            update_job(job, status='failed', error=str(e))
+            return
+
+        cache_analysis(prompt, analysis)
+        update_job(job, status='done', analysis=analysis, error=None)
+        return
@@ -1,102 +1,34 @@
+import time
+# 임포트 시간 측정 시작 (pandas/matplotlib/Gemini는 필요한 요청에서 처음 사용할 때 임포트)
+_import_started = time.perf_counter()
+
 import os
 import json
 import requests
-import pandas as pd
-import matplotlib
-# 스레드 안전을 위해 Matplotlib 백엔드를 'Agg'로 설정 (반드시 pyplot 임포트 전에 설정)
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
-import base64
-import sqlite3
-import asyncio
-from io import BytesIO
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, jsonify
-from matplotlib import font_manager, rc
-import sys
-import numpy as np
+from flask import Flask, render_template, request, jsonify, Response, abort, url_for, stream_with_context
 import logging
-from create_db import search_companies
-from finance_analysis import analyze_financial_data
+import hashlib
+import re
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from cache import LRUCache, SQLiteCache, FileCache, TieredCache
+from dart_client import DartClient
+from singleflight import SingleFlight
+import chart_pool
+from chart_pool import ChartQueueFull
+from financial_data import normalize_financial_data, PERIODS, BS_ACCOUNTS, BALANCE_ACCOUNTS, IS_ACCOUNTS
+from financial_metrics import get_metrics, RADAR_RATIOS
+from create_db import search_companies, get_companies_by_codes
+from finance_analysis import extract_financial_highlights, build_analysis_prompt, generate_fallback_analysis, stream_analysis
+from analysis_jobs import submit_analysis, get_job, get_cached_analysis, cache_analysis, analysis_cache, queue_stats, rate_limiter
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# 한글 폰트 설정
-def set_korean_font():
-    try:
-        # 폰트 경고 무시 설정
-        import warnings
-        warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
-        
-        # Docker 환경에서는 Noto Sans CJK 폰트 사용
-        if os.path.exists('/app'):
-            # Docker 환경 - Noto Sans CJK 사용
-            plt.rc('font', family='Noto Sans CJK KR')
-            logger.info("Docker 환경에서 Noto Sans CJK KR 폰트 사용")
-        # 윈도우의 경우 맑은 고딕 폰트 사용
-        elif sys.platform == 'win32':
-            font_path = "C:/Windows/Fonts/malgun.ttf"
-            if os.path.exists(font_path):
-                font_name = font_manager.FontProperties(fname=font_path).get_name()
-                plt.rc('font', family=font_name)
-                logger.info(f"Windows 환경에서 {font_name} 폰트 사용")
-            else:
-                plt.rc('font', family='DejaVu Sans')
-                logger.info("Windows 환경에서 DejaVu Sans 폰트 사용")
-        # Mac의 경우 애플고딕 폰트 사용
-        elif sys.platform == 'darwin':
-            rc('font', family='AppleGothic')
-            logger.info("Mac 환경에서 AppleGothic 폰트 사용")
-        # 리눅스의 경우 Noto Sans CJK 폰트 사용
-        else:
-            rc('font', family='Noto Sans CJK KR')
-            logger.info("Linux 환경에서 Noto Sans CJK KR 폰트 사용")
-        
-        # 마이너스 기호 표시 설정
-        matplotlib.rcParams['axes.unicode_minus'] = False
-        
-        # 폰트 크기 및 스타일 설정
-        plt.rcParams['font.size'] = 10
-        plt.rcParams['axes.titlesize'] = 12
-        plt.rcParams['axes.labelsize'] = 10
-        plt.rcParams['xtick.labelsize'] = 9
-        plt.rcParams['ytick.labelsize'] = 9
-        plt.rcParams['legend.fontsize'] = 9
-        plt.rcParams['figure.titlesize'] = 14
-        
-        # 그래프 스타일 설정
-        plt.style.use('default')
-        sns.set_palette("husl")
-        
-        # 폰트 캐시 초기화 (버전 호환성을 위해 try-except 사용)
-        try:
-            font_manager._rebuild()
-        except AttributeError:
-            try:
-                font_manager.fontManager.cache_clear()
-            except:
-                pass  # 폰트 캐시 초기화 실패해도 계속 진행
-        
-        return True
-    except Exception as e:
-        logger.error(f"한글 폰트 설정에 실패했습니다: {e}")
-        # 기본 폰트로 설정 (한글 지원 폰트 우선)
-        try:
-            plt.rc('font', family='Noto Sans CJK KR')
-            logger.info("fallback: Noto Sans CJK KR 폰트 사용")
-        except:
-            try:
-                plt.rc('font', family='NanumGothic')
-                logger.info("fallback: NanumGothic 폰트 사용")
-            except:
-                plt.rc('font', family='DejaVu Sans')
-                logger.info("fallback: DejaVu Sans 폰트 사용")
-        
-        matplotlib.rcParams['axes.unicode_minus'] = False
-        return False
+# 앱 임포트 시간 목표 (초). 넘으면 경고 로그를 남김
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', '1.0'))
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
@@ -108,12 +40,12 @@ if not API_KEY:
     logger.error("Error: OPEN_DART_API_KEY가 .env 파일에 설정되지 않았습니다.")
     exit(1)
 
+# DART API 클라이언트 (연결 재사용, 타임아웃, 재시도, 회로 차단기)
+dart_client = DartClient(API_KEY)
+
 # Flask 앱 생성
 app = Flask(__name__)
 
-# 한글 폰트 설정 실행
-set_korean_font()
-
 # 데이터베이스 존재 여부 확인
 def check_database():
     if not os.path.exists('corp_codes.db'):
@@ -124,27 +56,199 @@ def check_database():
             return False
     return True
 
+# 시작 시 한 번만 데이터베이스 준비 (준비되지 않은 경우에만 검색 시 다시 확인)
+# python app.py로 실행하면 spawn으로 띄운 차트 렌더링 프로세스가 이 파일을 __mp_main__으로 다시 임포트하므로,
+# 그때는 데이터베이스를 만들지 않음 (렌더링 프로세스는 회사 검색을 하지 않음)
+database_ready = __name__ == '__mp_main__' or check_database()
+if not database_ready:
+    logger.warning("회사 코드 데이터베이스(corp_codes.db)가 없습니다. download_corp_codes.py를 먼저 실행하세요.")
+
 # 회사 검색 함수
 def search_company_db(company_name, limit=10):
     """
     데이터베이스에서 회사명으로 검색합니다.
     """
-    if not check_database():
-        return []
+    global database_ready
+    if not database_ready:
+        database_ready = check_database()
+        if not database_ready:
+            return []
     
     return search_companies(company_name, limit)
 
-# 재무제표 데이터 가져오기
+# 재무제표 응답 캐시 (메모리 LRU + corp_codes.db 옆의 SQLite 파일)
+ANNUAL_REPORT_CODE = '11011'
+FILED_REPORT_TTL = 30 * 24 * 60 * 60  # 제출이 끝난 보고서: 30일
+RECENT_REPORT_TTL = 6 * 60 * 60  # 제출/정정 가능성이 있는 보고서: 6시간
+
+financial_cache = TieredCache(
+    'financial_data',
+    LRUCache(maxsize=256),
+    SQLiteCache('dart_cache.db', table='financial_data', max_entries=20000)
+)
+
+def financial_data_ttl(bsns_year, reprt_code, today=None):
+    """
+    보고서 제출 여부에 따라 캐시 유효 시간을 결정합니다.
+    사업보고서는 다음 해 3월 말까지 제출되므로 그 이후에는 긴 TTL을, 당해 연도 보고서는 짧은 TTL을 사용합니다.
+    """
+    today = today or date.today()
+    try:
+        year = int(bsns_year)
+    except (TypeError, ValueError):
+        return RECENT_REPORT_TTL
+    
+    if reprt_code == ANNUAL_REPORT_CODE:
+        filed = year < today.year - 1 or (year == today.year - 1 and today.month >= 4)
+    else:
+        filed = year < today.year
+    
+    return FILED_REPORT_TTL if filed else RECENT_REPORT_TTL
+
+# 같은 보고서를 동시에 요청하면 DART 요청은 한 번만 보냄
+financial_flight = SingleFlight('financial_data')
+
+# 재무제표 데이터 가져오기 (캐시 우선)
 def get_financial_data(corp_code, bsns_year, reprt_code):
-    url = f"https://opendart.fss.or.kr/api/fnlttSinglAcnt.json"
+    cache_key = f"{corp_code}:{bsns_year}:{reprt_code}"
+    ttl = financial_data_ttl(bsns_year, reprt_code)
+    
+    data = financial_cache.get(cache_key, ttl)
+    if data is not None:
+        return data
+    
+    return financial_flight.do(cache_key, load_financial_data, corp_code, bsns_year, reprt_code)
+
+def load_financial_data(corp_code, bsns_year, reprt_code):
+    """
+    DART에서 재무제표를 받아 캐시에 저장합니다. (SingleFlight로 키마다 한 번만 실행)
+    """
+    cache_key = f"{corp_code}:{bsns_year}:{reprt_code}"
+    ttl = financial_data_ttl(bsns_year, reprt_code)
+    
+    # 직전에 끝난 요청이 이미 캐시를 채웠을 수 있음 (get_financial_data에서 이미 센 조회라 다시 세지 않음)
+    data = financial_cache.get(cache_key, ttl, count=False)
+    if data is not None:
+        return data
+    
+    data = fetch_financial_data(corp_code, bsns_year, reprt_code)
+    if data is not None:
+        financial_cache.set(cache_key, data, ttl)
+    
+    return data
+
+# 정규화된 재무제표 (차트와 AI 분석이 같은 보고서를 다시 파싱하지 않도록 메모리에 보관)
+statement_cache = LRUCache(maxsize=256)
+
+def get_financial_statement(corp_code, bsns_year, reprt_code):
+    """
+    재무제표를 가져와 FinancialStatement로 정규화합니다. (보고서별로 한 번만 정규화)
+    
+    Returns:
+        FinancialStatement. 데이터가 없으면 None
+    """
+    cache_key = f"{corp_code}:{bsns_year}:{reprt_code}"
+    statement = statement_cache.get(cache_key)
+    if statement is not None:
+        return statement
+    
+    statement = normalize_financial_data(get_financial_data(corp_code, bsns_year, reprt_code))
+    if statement is not None:
+        statement_cache.set(cache_key, statement, financial_data_ttl(bsns_year, reprt_code))
+    return statement
+
+def get_financial_statements(corp_codes, bsns_year, reprt_code):
+    """
+    여러 회사의 재무제표를 FinancialStatement로 가져옵니다. (캐시에 없는 회사만 다중회사 API로 요청)
+    
+    Returns:
+        {고유번호: FinancialStatement} 딕셔너리 (데이터가 없는 회사는 제외)
+    """
+    ttl = financial_data_ttl(bsns_year, reprt_code)
+    statements = {}
+    missing = []
+    
+    for corp_code in dict.fromkeys(corp_codes):
+        statement = statement_cache.get(f"{corp_code}:{bsns_year}:{reprt_code}")
+        if statement is not None:
+            statements[corp_code] = statement
+        else:
+            missing.append(corp_code)
+    
+    for corp_code, financial_data in get_financial_data_batch(missing, bsns_year, reprt_code).items():
+        statement = normalize_financial_data(financial_data)
+        if statement is not None:
+            statement_cache.set(f"{corp_code}:{bsns_year}:{reprt_code}", statement, ttl)
+            statements[corp_code] = statement
+    
+    return statements
+
+# 연도별 추이 (사업보고서 하나에 당기/전기/전전기 3개년이 있으므로 3년마다 한 번씩 요청)
+TIMESERIES_DEFAULT_YEARS = 5
+TIMESERIES_MAX_YEARS = 10
+TIMESERIES_ACCOUNTS = ['자산총계', '부채총계', '자본총계', '매출액', '영업이익', '당기순이익']
+TIMESERIES_MAX_WORKERS = 4
+
+# 연도별 요청을 동시에 보내는 스레드 풀 (요청 간 공유하여 전체 동시 요청 수를 제한)
+timeseries_executor = ThreadPoolExecutor(max_workers=TIMESERIES_MAX_WORKERS, thread_name_prefix='timeseries')
+
+def timeseries_filing_years(end_year, years):
+    """
+    end_year부터 years개 연도를 덮는 데 필요한 사업보고서 연도 목록을 반환합니다. (예: 2023, 5 -> [2023, 2020])
+    """
+    return list(range(end_year, end_year - years, -len(PERIODS)))
+
+def get_financial_timeseries(corp_code, end_year, years=TIMESERIES_DEFAULT_YEARS):
+    """
+    사업보고서의 당기/전기/전전기 금액을 이어 붙여 연도별 계정 금액표를 만듭니다.
+    필요한 보고서는 스레드 풀에서 동시에 요청합니다.
+    
+    Args:
+        corp_code: 고유번호
+        end_year: 마지막 사업연도
+        years: 조회할 연도 수
+        
+    Returns:
+        계정과목 인덱스, 연도 컬럼(오래된 순)의 DataFrame. 데이터가 없으면 None
+    """
+    filing_years = timeseries_filing_years(end_year, years)
+    statements = timeseries_executor.map(
+        lambda year: get_financial_statement(corp_code, str(year), ANNUAL_REPORT_CODE),
+        filing_years
+    )
+    
+    # 같은 연도가 여러 보고서에 있으면 최근 보고서(재작성된 비교 금액)를 사용
+    series = {}
+    for filing_year, statement in zip(filing_years, statements):
+        if statement is None:
+            continue
+        amounts = statement.select(TIMESERIES_ACCOUNTS)
+        for offset, period in enumerate(PERIODS):
+            year = filing_year - offset
+            if period not in statement.periods or year in series or year <= end_year - years:
+                continue
+            series[year] = amounts[period]
+    
+    if not series:
+        return None
+    
+    import pandas as pd
+    timeseries = pd.DataFrame({year: series[year] for year in sorted(series)})
+    return timeseries.reindex([account for account in TIMESERIES_ACCOUNTS if account in timeseries.index])
+
+# DART API에서 재무제표 데이터 요청
+def fetch_financial_data(corp_code, bsns_year, reprt_code):
     params = {
-        'crtfc_key': API_KEY,
         'corp_code': corp_code,
         'bsns_year': bsns_year,
         'reprt_code': reprt_code
     }
     
-    response = requests.get(url, params=params)
+    try:
+        response = dart_client.get('fnlttSinglAcnt.json', params=params)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"재무제표 데이터 요청 실패: {e}")
+        return None
     
     if response.status_code != 200:
         logger.error(f"재무제표 데이터 요청 실패 (Status Code: {response.status_code})")
@@ -158,262 +262,294 @@ def get_financial_data(corp_code, bsns_year, reprt_code):
     
     return data
 
-# 그래프를 이미지로 변환
-def fig_to_base64(fig):
-    buf = BytesIO()
-    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close(fig)
-    return img_str
-
-# 재무제표 데이터 처리 및 시각화
-def process_and_visualize(financial_data):
-    if not financial_data or 'list' not in financial_data:
+# 다중회사 주요계정 API는 한 번에 최대 100개 회사까지 조회 가능
+MULTI_ACCOUNT_BATCH_SIZE = 100
+NO_DATA_STATUS = '013'
+
+def get_financial_data_batch(corp_codes, bsns_year, reprt_code):
+    """
+    여러 회사의 재무제표를 캐시에서 찾고, 없는 회사만 다중회사 API로 한꺼번에 요청합니다.
+    받아온 데이터는 회사별로 나누어 get_financial_data()와 같은 캐시에 저장합니다.
+    
+    Args:
+        corp_codes: 고유번호 목록
+        bsns_year: 사업연도
+        reprt_code: 보고서 코드
+        
+    Returns:
+        {고유번호: 재무제표 데이터} 딕셔너리 (데이터가 없는 회사는 제외)
+    """
+    ttl = financial_data_ttl(bsns_year, reprt_code)
+    results = {}
+    missing = []
+    
+    for corp_code in dict.fromkeys(corp_codes):
+        data = financial_cache.get(f"{corp_code}:{bsns_year}:{reprt_code}", ttl)
+        if data is not None:
+            results[corp_code] = data
+        else:
+            missing.append(corp_code)
+    
+    for start in range(0, len(missing), MULTI_ACCOUNT_BATCH_SIZE):
+        chunk = missing[start:start + MULTI_ACCOUNT_BATCH_SIZE]
+        for corp_code, data in fetch_financial_data_batch(chunk, bsns_year, reprt_code).items():
+            financial_cache.set(f"{corp_code}:{bsns_year}:{reprt_code}", data, ttl)
+            results[corp_code] = data
+    
+    return results
+
+# DART 다중회사 주요계정 API에서 재무제표 데이터 요청
+def fetch_financial_data_batch(corp_codes, bsns_year, reprt_code):
+    """
+    다중회사 주요계정 API(fnlttMultiAcnt)로 여러 회사의 재무제표를 한 번에 요청하고 회사별 응답으로 나눕니다.
+    
+    Returns:
+        {고유번호: fetch_financial_data()와 같은 형식의 재무제표 데이터}
+    """
+    params = {
+        'corp_code': ','.join(corp_codes),
+        'bsns_year': bsns_year,
+        'reprt_code': reprt_code
+    }
+    
+    try:
+        response = dart_client.get('fnlttMultiAcnt.json', params=params)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"다중회사 재무제표 데이터 요청 실패: {e}")
+        return {}
+    
+    if response.status_code != 200:
+        logger.error(f"다중회사 재무제표 데이터 요청 실패 (Status Code: {response.status_code})")
+        return {}
+    
+    data = response.json()
+    
+    if data['status'] == NO_DATA_STATUS:
+        return {}
+    
+    if data['status'] != '000':
+        logger.error(f"다중회사 재무제표 데이터 요청 실패 (Status: {data['status']})")
+        return {}
+    
+    # 회사별로 계정 행 나누기
+    rows_by_company = {}
+    for row in data.get('list', []):
+        rows_by_company.setdefault(row.get('corp_code'), []).append(row)
+    
+    return {
+        corp_code: {'status': data['status'], 'message': data.get('message'), 'list': rows}
+        for corp_code, rows in rows_by_company.items()
+        if corp_code in corp_codes
+    }
+
+# 차트 이미지 캐시 (메모리 LRU + chart_cache 디렉터리)
+# 렌더링 방식이 바뀌면 CHART_VERSION을 올려 이전 이미지를 무효화합니다.
+CHART_VERSION = 5
+STATEMENT_CHART_KINDS = ('bs', 'balance', 'is', 'ratio')
+CHART_KINDS = STATEMENT_CHART_KINDS + ('trend',)
+CHART_PERIODS = ['당기', '전기']
+CHART_KEY_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+chart_cache = TieredCache(
+    'charts',
+    LRUCache(maxsize=256),
+    FileCache('chart_cache', suffix='.png', max_entries=20000)
+)
+
+# 같은 차트를 동시에 요청하면 한 번만 그림
+chart_flight = SingleFlight('charts')
+
+# 차트 키별 원본 계정 행 (차트 이미지 요청 시 필요한 차트만 그리기 위해 보관)
+chart_source_cache = TieredCache(
+    'chart_sources',
+    LRUCache(maxsize=512),
+    SQLiteCache('dart_cache.db', table='chart_sources', max_entries=20000)
+)
+
+def chart_source(rows, ratios=None):
+    """
+    차트용 금액표와 재무비율을 캐시에 저장할 수 있는 형태로 바꿉니다.
+    금액표는 컬럼 이름(기간 또는 연도)과 [계정과목, 금액...] 목록으로 저장합니다. (빈 금액은 None)
+    """
+    import pandas as pd
+    return {
+        'columns': [str(column) for column in rows.columns],
+        'rows': [
+            [account, *(None if pd.isna(amount) else int(amount) for amount in amounts)]
+            for account, amounts in zip(rows.index, rows.values)
+        ],
+        'ratios': ratios or {},
+    }
+
+def chart_cache_key(source):
+    """
+    차트에 사용되는 계정 금액으로 캐시 키를 만듭니다.
+    같은 내용의 재무제표는 회사/보고서가 달라도 같은 이미지를 공유합니다.
+    """
+    payload = json.dumps(source, ensure_ascii=False)
+    return hashlib.sha256(f"{CHART_VERSION}:{payload}".encode('utf-8')).hexdigest()[:32]
+
+def available_chart_kinds(rows):
+    """
+    계정 금액표로 그릴 수 있는 차트 종류를 반환합니다.
+    """
+    accounts = set(rows.index)
+    kinds = []
+    if accounts & set(BS_ACCOUNTS):
+        kinds.append('bs')
+    if set(BS_ACCOUNTS) <= accounts:
+        kinds.append('balance')
+    if accounts & set(IS_ACCOUNTS):
+        kinds.append('is')
+    if set(BS_ACCOUNTS + IS_ACCOUNTS) <= accounts:
+        kinds.append('ratio')
+    return kinds
+
+# 재무제표 데이터 처리 (차트 원본 준비)
+def prepare_charts(statement):
+    """
+    정규화된 재무제표에서 차트에 필요한 계정 금액을 골라 캐시에 보관합니다.
+    이미지는 /charts/<key>/<kind>.png 요청 시 종류별로 그려집니다.
+    
+    Args:
+        statement: FinancialStatement
+        
+    Returns:
+        (차트 키, 그릴 수 있는 차트 종류 목록, chart_source()로 만든 차트 원본). 데이터가 없으면 (None, [], None)
+    """
+    if statement is None or statement.empty:
         logger.warning("재무제표 데이터가 비어있거나 예상과 다릅니다.")
-        return None, None, None, None
+        return None, [], None
     
-    # 폰트 경고 무시 설정
-    import warnings
-    warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
+    # 차트에 필요한 계정과목 선택
+    rows = statement.select(BALANCE_ACCOUNTS + IS_ACCOUNTS, CHART_PERIODS)
+    if rows.empty:
+        return None, [], None
     
-    # 데이터프레임 생성
-    df = pd.DataFrame(financial_data['list'])
+    # 레이더 차트는 AI 분석과 같은 재무비율 계산 결과를 사용
+    source = chart_source(rows, get_metrics(statement)['재무비율'])
+    chart_key = chart_cache_key(source)
+    if chart_source_cache.get(chart_key) is None:
+        chart_source_cache.set(chart_key, source)
     
-    # 연결 재무제표만 필터링
-    cfs_df = df[df['fs_div'] == 'CFS']
-    if cfs_df.empty:
-        cfs_df = df[df['fs_div'] == 'OFS']
+    return chart_key, available_chart_kinds(rows), source
+
+# 브라우저 차트용 데이터 (금액 단위: 10억원)
+CHART_DATA_UNIT = 1_000_000_000
+
+def chart_series(source, kinds):
+    """
+    차트 원본을 브라우저의 차트 라이브러리가 바로 그릴 수 있는 숫자 배열로 바꿉니다.
+    PNG 차트와 같은 데이터를 사용하며, 그릴 수 없는 차트는 None입니다.
+    
+    Args:
+        source: prepare_charts()가 반환한 차트 원본
+        kinds: 그릴 수 있는 차트 종류 목록
+        
+    Returns:
+        {'unit', 'periods', 'bs', 'balance', 'is', 'ratio'} 딕셔너리
+    """
+    amounts = {row[0]: dict(zip(source['columns'], row[1:])) for row in source['rows']}
     
-    # 필요한 계정과목 선택 (재무상태표 - 기본)
-    bs_accounts = ['자산총계', '부채총계', '자본총계']
-    bs_data = cfs_df[cfs_df['account_nm'].isin(bs_accounts)].copy()
+    def billions(amount):
+        return round(amount / CHART_DATA_UNIT, 1)
     
-    # 자산=부채+자본 관계용 세부 계정과목
-    balance_accounts = ['자산총계', '부채총계', '자본총계', '유동자산', '비유동자산', '유동부채', '비유동부채']
-    balance_data = cfs_df[cfs_df['account_nm'].isin(balance_accounts)].copy()
+    def bar_series(accounts):
+        # 계정과목 목록과 기간별 금액 배열 (막대그래프)
+        present = [account for account in accounts if account in amounts]
+        return {
+            'accounts': present,
+            **{period: [billions(amounts[account][period]) for account in present] for period in CHART_PERIODS}
+        }
     
-    # 필요한 계정과목 선택 (손익계산서)
-    is_accounts = ['매출액', '영업이익', '당기순이익']
-    is_data = cfs_df[cfs_df['account_nm'].isin(is_accounts)].copy()
+    series = {
+        'unit': '10억원',
+        'periods': CHART_PERIODS,
+        'bs': bar_series(BS_ACCOUNTS) if 'bs' in kinds else None,
+        'balance': None,
+        'is': bar_series(IS_ACCOUNTS) if 'is' in kinds else None,
+        'ratio': None,
+    }
     
-    # 한글 폰트 설정
-    set_korean_font()
+    if 'balance' in kinds:
+        # 자산 = 부채 + 자본 검증 (PNG 차트와 같이 10억원 미만 차이는 균형으로 판단)
+        current = {account: amounts[account]['당기'] for account in BALANCE_ACCOUNTS if account in amounts}
+        difference = current['자산총계'] - (current['부채총계'] + current['자본총계'])
+        series['balance'] = {
+            'amounts': {account: billions(amount) for account, amount in current.items()},
+            'difference': billions(difference),
+            'balanced': abs(difference) < CHART_DATA_UNIT,
+        }
     
-    # 결과 저장할 이미지 변수
-    bs_img = None
-    is_img = None
-    ratio_img = None
-    balance_img = None
+    if 'ratio' in kinds:
+        # 분모가 0 이하라 계산하지 않은 비율은 null (브라우저에서 PNG 레이더 차트와 같이 N/A로 표시)
+        series['ratio'] = {
+            'labels': [label for label, _ in RADAR_RATIOS],
+            'values': [source['ratios'].get(name) for _, name in RADAR_RATIOS],
+        }
     
+    return series
+
+# 연도별 추이 차트 원본 준비
+def prepare_trend_chart(timeseries):
+    """
+    연도별 계정 금액표를 캐시에 보관합니다.
+    
+    Returns:
+        (차트 키, chart_source()로 변환한 금액표)
+    """
+    source = chart_source(timeseries)
+    chart_key = chart_cache_key(source)
+    if chart_source_cache.get(chart_key) is None:
+        chart_source_cache.set(chart_key, source)
+    return chart_key, source
+
+# 차트 이미지 가져오기 (캐시 우선)
+def get_chart_image(chart_key, kind):
+    """
+    차트 이미지를 캐시에서 찾고, 없으면 보관된 계정 행으로 해당 차트만 그립니다.
+    
+    Returns:
+        PNG 바이트. 그릴 수 없는 차트는 b'', 알 수 없는 키는 None
+    
+    Raises:
+        ChartQueueFull: 렌더링 대기열이 가득 찬 경우
+    """
+    cache_key = f"{chart_key}/{kind}"
+    image = chart_cache.get(cache_key)
+    if image is not None:
+        return image
+    
+    return chart_flight.do(cache_key, render_chart_image, chart_key, kind)
+
+def render_chart_image(chart_key, kind):
+    """
+    보관된 계정 행으로 차트를 그려 캐시에 저장합니다. (SingleFlight로 차트마다 한 번만 실행)
+    """
+    cache_key = f"{chart_key}/{kind}"
+    
+    # 직전에 끝난 요청이 이미 그렸을 수 있음 (get_chart_image에서 이미 센 조회라 다시 세지 않음)
+    image = chart_cache.get(cache_key, count=False)
+    if image is not None:
+        return image
+    
+    source = chart_source_cache.get(chart_key)
+    if source is None:
+        return None
+    
+    # 차트는 렌더링 프로세스 풀에서 그림 (matplotlib은 워커 프로세스에서만 임포트)
     try:
-        # 1. 재무상태표 시각화 (당기, 전기만) - 이전과 동일
-        if not bs_data.empty:
-            # 문자열 금액을 숫자로 변환 (안전한 처리)
-            for col in ['thstrm_amount', 'frmtrm_amount']:
-                if col in bs_data.columns:
-                    bs_data.loc[:, col] = bs_data[col].astype(str).str.replace(',', '').replace('', '0').astype(float) / 1_000_000_000  # 10억 단위로 변환
-            
-            # 당기, 전기 데이터만 준비
-            current_year = bs_data[['account_nm', 'thstrm_amount']].rename(columns={'thstrm_amount': '당기'})
-            prev_year = bs_data[['account_nm', 'frmtrm_amount']].rename(columns={'frmtrm_amount': '전기'})
-            
-            # 데이터 병합
-            merged_data = current_year.merge(prev_year, on='account_nm')
-            merged_data = merged_data.set_index('account_nm')
-            
-            # 그래프 그리기
-            fig, ax = plt.subplots(figsize=(10, 6))
-            merged_data.plot(kind='bar', ax=ax, color=['#3498db', '#e74c3c'])
-            plt.title('재무상태표 (단위: 10억원)', fontsize=16, fontweight='bold')
-            plt.ylabel('금액 (10억원)')
-            plt.xticks(rotation=0)
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-            
-            # 값 표시
-            for container in ax.containers:
-                ax.bar_label(container, fmt='%.1f')
-            
-            plt.tight_layout()
-            bs_img = fig_to_base64(fig)
-            
-            # 2. 자산 = 부채 + 자본 관계 시각화
-            try:
-                # 당기 데이터 추출 (10억원 단위)
-                balance_current_year = balance_data[['account_nm', 'thstrm_amount']].rename(columns={'thstrm_amount': '당기'})
-                
-                # 문자열 금액을 숫자로 변환 (10억 단위, 안전한 처리)
-                balance_current_year.loc[:, '당기'] = balance_current_year['당기'].astype(str).str.replace(',', '').replace('', '0').astype(float) / 1_000_000_000
-                
-                assets = balance_current_year.loc[balance_current_year['account_nm'] == '자산총계', '당기'].values[0]
-                liabilities = balance_current_year.loc[balance_current_year['account_nm'] == '부채총계', '당기'].values[0]
-                equity = balance_current_year.loc[balance_current_year['account_nm'] == '자본총계', '당기'].values[0]
-                
-                # 세부 항목 추출
-                current_assets = balance_current_year.loc[balance_current_year['account_nm'] == '유동자산', '당기'].values[0] if '유동자산' in balance_current_year['account_nm'].values else 0
-                non_current_assets = balance_current_year.loc[balance_current_year['account_nm'] == '비유동자산', '당기'].values[0] if '비유동자산' in balance_current_year['account_nm'].values else 0
-                current_liabilities = balance_current_year.loc[balance_current_year['account_nm'] == '유동부채', '당기'].values[0] if '유동부채' in balance_current_year['account_nm'].values else 0
-                non_current_liabilities = balance_current_year.loc[balance_current_year['account_nm'] == '비유동부채', '당기'].values[0] if '비유동부채' in balance_current_year['account_nm'].values else 0
-                
-                # 반올림
-                assets = round(assets)
-                liabilities = round(liabilities)
-                equity = round(equity)
-                current_assets = round(current_assets)
-                non_current_assets = round(non_current_assets)
-                current_liabilities = round(current_liabilities)
-                non_current_liabilities = round(non_current_liabilities)
-                
-                # 자산 = 부채 + 자본 관계 시각화 (텍스트 기반)
-                fig, ax = plt.subplots(figsize=(12, 8))
-                ax.axis('off')
-                
-                # 배경 박스 그리기
-                rect = plt.Rectangle((0.1, 0.1), 0.8, 0.8, linewidth=3, edgecolor='#2c3e50', facecolor='none')
-                ax.add_patch(rect)
-                
-                # 제목
-                ax.text(0.5, 0.95, '자산 = 부채 + 자본', fontsize=20, fontweight='bold', 
-                       ha='center', va='center', color='#2c3e50')
-                
-                # 자산 부분 (왼쪽)
-                ax.text(0.25, 0.75, '자산', fontsize=16, fontweight='bold', 
-                       ha='center', va='center', color='#2c3e50')
-                ax.text(0.25, 0.65, f'{assets:,}억원', fontsize=14, 
-                       ha='center', va='center', color='#2c3e50')
-                
-                # 자산 세부 내역
-                ax.text(0.25, 0.55, f'유동자산: {current_assets:,}억원', fontsize=12, 
-                       ha='center', va='center', color='#3498db')
-                ax.text(0.25, 0.45, f'비유동자산: {non_current_assets:,}억원', fontsize=12, 
-                       ha='center', va='center', color='#e74c3c')
-                
-                # 부채 + 자본 부분 (오른쪽)
-                ax.text(0.75, 0.75, '부채 + 자본', fontsize=16, fontweight='bold', 
-                       ha='center', va='center', color='#2c3e50')
-                ax.text(0.75, 0.65, f'{liabilities + equity:,}억원', fontsize=14, 
-                       ha='center', va='center', color='#2c3e50')
-                
-                # 부채 세부 내역
-                ax.text(0.75, 0.55, f'유동부채: {current_liabilities:,}억원', fontsize=12, 
-                       ha='center', va='center', color='#f39c12')
-                ax.text(0.75, 0.45, f'비유동부채: {non_current_liabilities:,}억원', fontsize=12, 
-                       ha='center', va='center', color='#9b59b6')
-                
-                # 자본
-                ax.text(0.75, 0.35, f'자본: {equity:,}억원', fontsize=12, 
-                       ha='center', va='center', color='#27ae60')
-                
-                # 등호 표시
-                ax.text(0.5, 0.25, '=', fontsize=24, fontweight='bold', 
-                       ha='center', va='center', color='#e74c3c')
-                
-                # 검증 메시지
-                if abs(assets - (liabilities + equity)) < 1:  # 1억원 이내 차이
-                    ax.text(0.5, 0.15, '✓ 자산 = 부채 + 자본 (균형)', fontsize=12, 
-                           ha='center', va='center', color='#27ae60', fontweight='bold')
-                else:
-                    ax.text(0.5, 0.15, f'⚠ 차이: {abs(assets - (liabilities + equity)):,.0f}억원', fontsize=12, 
-                           ha='center', va='center', color='#e74c3c', fontweight='bold')
-                
-                plt.tight_layout()
-                balance_img = fig_to_base64(fig)
-            except Exception as e:
-                logger.error(f"자산-부채-자본 관계 그래프 생성 중 오류 발생: {e}")
-            
-            # 3. 손익계산서 시각화 (당기, 전기만)
-            if not is_data.empty:
-                # 문자열 금액을 숫자로 변환 (안전한 처리)
-                for col in ['thstrm_amount', 'frmtrm_amount']:
-                    if col in is_data.columns:
-                        is_data.loc[:, col] = is_data[col].astype(str).str.replace(',', '').replace('', '0').astype(float) / 1_000_000_000  # 10억 단위로 변환
-                
-                # 당기, 전기 데이터만 준비
-                current_year = is_data[['account_nm', 'thstrm_amount']].rename(columns={'thstrm_amount': '당기'})
-                prev_year = is_data[['account_nm', 'frmtrm_amount']].rename(columns={'frmtrm_amount': '전기'})
-                
-                # 데이터 병합
-                merged_data = current_year.merge(prev_year, on='account_nm')
-                merged_data = merged_data.set_index('account_nm')
-                
-                # 그래프 그리기
-                fig, ax = plt.subplots(figsize=(10, 6))
-                merged_data.plot(kind='bar', ax=ax, color=['#3498db', '#e74c3c'])
-                plt.title('손익계산서 (단위: 10억원)', fontsize=16, fontweight='bold')
-                plt.ylabel('금액 (10억원)')
-                plt.xticks(rotation=0)
-                plt.grid(axis='y', linestyle='--', alpha=0.7)
-                
-                # 값 표시
-                for container in ax.containers:
-                    ax.bar_label(container, fmt='%.1f')
-                
-                plt.tight_layout()
-                is_img = fig_to_base64(fig)
-            
-            # 4. 주요 재무비율 시각화 (5각형 레이더 차트)
-            try:
-                # 재무비율 계산
-                if not bs_data.empty and not is_data.empty:
-                    # 당기 데이터 추출
-                    bs_current = bs_data[['account_nm', 'thstrm_amount']].set_index('account_nm')
-                    is_current = is_data[['account_nm', 'thstrm_amount']].set_index('account_nm')
-                    
-                    # 문자열 금액을 숫자로 변환 (안전한 처리)
-                    for df in [bs_current, is_current]:
-                        df['thstrm_amount'] = df['thstrm_amount'].astype(str).str.replace(',', '').replace('', '0').astype(float)
-                    
-                    # 재무비율 계산
-                    total_assets = bs_current.loc['자산총계', 'thstrm_amount']
-                    total_liabilities = bs_current.loc['부채총계', 'thstrm_amount']
-                    total_equity = bs_current.loc['자본총계', 'thstrm_amount']
-                    sales = is_current.loc['매출액', 'thstrm_amount']
-                    operating_income = is_current.loc['영업이익', 'thstrm_amount']
-                    net_income = is_current.loc['당기순이익', 'thstrm_amount']
-                    
-                    # 재무비율 계산
-                    debt_ratio = (total_liabilities / total_equity) * 100  # 부채비율
-                    roa = (net_income / total_assets) * 100  # ROA
-                    roe = (net_income / total_equity) * 100  # ROE
-                    operating_margin = (operating_income / sales) * 100  # 영업이익률
-                    net_margin = (net_income / sales) * 100  # 순이익률
-                    
-                    # 레이더 차트 그리기
-                    categories = ['부채비율', 'ROA', 'ROE', '영업이익률', '순이익률']
-                    values = [debt_ratio, roa, roe, operating_margin, net_margin]
-                    
-                    # 각도 계산
-                    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
-                    values += values[:1]  # 첫 번째 값을 마지막에 추가하여 닫힌 도형 만들기
-                    angles += angles[:1]
-                    
-                    fig, ax = plt.subplots(figsize=(10, 8), subplot_kw=dict(projection='polar'))
-                    ax.plot(angles, values, 'o-', linewidth=2, color='#3498db')
-                    ax.fill(angles, values, alpha=0.25, color='#3498db')
-                    
-                    # 축 레이블 설정
-                    ax.set_xticks(angles[:-1])
-                    ax.set_xticklabels(categories)
-                    
-                    # 그리드 설정
-                    ax.grid(True)
-                    
-                    # 제목
-                    plt.title('주요 재무비율 (5각형 레이더 차트)', fontsize=16, fontweight='bold', pad=20)
-                    
-                    # 값 표시
-                    for i, (angle, value) in enumerate(zip(angles[:-1], values[:-1])):
-                        ax.text(angle, value + max(values) * 0.1, f'{value:.1f}%', 
-                               ha='center', va='center', fontweight='bold')
-                    
-                    plt.tight_layout()
-                    ratio_img = fig_to_base64(fig)
-            except (IndexError, ValueError) as e:
-                logger.error(f"재무비율 계산 중 오류 발생: {e}")
+        image = chart_pool.render(kind, source)
+    except ChartQueueFull:
+        raise
     except Exception as e:
-        logger.error(f"그래프 생성 중 오류 발생: {e}")
+        # 일시적인 오류일 수 있으므로 캐시하지 않음
+        logger.error(f"그래프 생성 중 오류 발생 ({kind}): {e}")
+        return b''
     
-    return bs_img, is_img, ratio_img, balance_img
+    image = image or b''
+    chart_cache.set(cache_key, image)
+    return image
 
 # 메인 페이지
 @app.route('/')
@@ -442,26 +578,166 @@ def visualize():
     corp_name = request.form.get('corp_name')
     bsns_year = request.form.get('bsns_year')
     reprt_code = request.form.get('reprt_code')
+    output_format = request.args.get('format', 'png')
     
     if not all([corp_code, corp_name, bsns_year, reprt_code]):
         return jsonify({'error': '모든 필수 항목을 입력해주세요.'})
     
-    financial_data = get_financial_data(corp_code, bsns_year, reprt_code)
+    if output_format not in ('png', 'data'):
+        return jsonify({'error': "format은 'png' 또는 'data'만 사용할 수 있습니다."})
     
-    if not financial_data:
+    statement = get_financial_statement(corp_code, bsns_year, reprt_code)
+    
+    if statement is None:
         return jsonify({'error': '재무제표 데이터를 가져오는데 실패했습니다.'})
     
-    bs_img, is_img, ratio_img, balance_img = process_and_visualize(financial_data)
+    chart_key, kinds, source = prepare_charts(statement)
+    
+    # 차트 이미지는 URL로 전달 (브라우저가 병렬로 요청하고 캐시함)
+    chart_urls = {
+        f'{kind}_img_url': url_for('chart_image', chart_key=chart_key, kind=kind) if kind in kinds else None
+        for kind in STATEMENT_CHART_KINDS
+    }
+    
+    # format=data: 브라우저에서 직접 그릴 숫자 데이터를 함께 반환 (PNG URL은 내보내기용으로 유지)
+    if output_format == 'data':
+        return jsonify({
+            **chart_urls,
+            'charts': chart_series(source, kinds) if source is not None else None,
+            'corp_name': corp_name,
+            'bsns_year': bsns_year
+        })
+    
+    # 브라우저가 이미지를 요청하기 전에 렌더링 프로세스를 미리 띄움
+    if kinds:
+        chart_pool.start()
     
     return jsonify({
-        'bs_img': bs_img,
-        'is_img': is_img,
-        'ratio_img': ratio_img,
-        'balance_img': balance_img,
+        **chart_urls,
         'corp_name': corp_name,
         'bsns_year': bsns_year
     })
 
+# 기업 비교 API (한 번에 비교할 수 있는 최대 회사 수)
+COMPARE_MAX_COMPANIES = 50
+
+@app.route('/api/compare', methods=['POST'])
+def compare():
+    corp_codes = list(dict.fromkeys(
+        code.strip() for code in request.form.get('corp_codes', '').split(',') if code.strip()
+    ))
+    bsns_year = request.form.get('bsns_year')
+    reprt_code = request.form.get('reprt_code')
+    
+    if not all([corp_codes, bsns_year, reprt_code]):
+        return jsonify({'error': '모든 필수 항목을 입력해주세요.'})
+    
+    if len(corp_codes) > COMPARE_MAX_COMPANIES:
+        return jsonify({'error': f'한 번에 최대 {COMPARE_MAX_COMPANIES}개 회사까지 비교할 수 있습니다.'})
+    
+    statements = get_financial_statements(corp_codes, bsns_year, reprt_code)
+    # 회사명은 회사 코드 데이터베이스에서 조회 (다중회사 API 응답에는 회사명이 없음)
+    company_info = get_companies_by_codes(list(statements)) if database_ready else {}
+    
+    companies = []
+    for corp_code in corp_codes:
+        statement = statements.get(corp_code)
+        if statement is None:
+            continue
+        
+        metrics = get_metrics(statement)
+        info = company_info.get(corp_code, {})
+        companies.append({
+            'corp_code': corp_code,
+            'corp_name': info.get('corp_name') or statement.info['회사명'],
+            'stock_code': info.get('stock_code') or statement.info['종목코드'],
+            'fs_div': statement.fs_div,
+            'amounts': {account: statement.get(account) for account in BS_ACCOUNTS + IS_ACCOUNTS if account in statement},
+            'ratios': metrics['재무비율'],
+            'growth': {account: rates['당기'] for account, rates in metrics['성장률'].items()}
+        })
+    
+    return jsonify({
+        'companies': companies,
+        'missing': [corp_code for corp_code in corp_codes if corp_code not in statements],
+        'bsns_year': bsns_year,
+        'reprt_code': reprt_code
+    })
+
+# 연도별 추이 API (사업보고서 기준)
+@app.route('/api/timeseries', methods=['POST'])
+def timeseries():
+    corp_code = request.form.get('corp_code')
+    corp_name = request.form.get('corp_name')
+    end_year = request.form.get('bsns_year')
+    
+    if not all([corp_code, corp_name, end_year]):
+        return jsonify({'error': '모든 필수 항목을 입력해주세요.'})
+    
+    try:
+        end_year = int(end_year)
+        years = int(request.form.get('years', TIMESERIES_DEFAULT_YEARS))
+    except ValueError:
+        return jsonify({'error': '사업연도와 조회 기간은 숫자로 입력해주세요.'})
+    
+    years = max(1, min(years, TIMESERIES_MAX_YEARS))
+    timeseries_data = get_financial_timeseries(corp_code, end_year, years)
+    
+    if timeseries_data is None:
+        return jsonify({'error': '재무제표 데이터를 가져오는데 실패했습니다.'})
+    
+    chart_key, source = prepare_trend_chart(timeseries_data)
+    chart_pool.start()
+    
+    return jsonify({
+        'years': [int(year) for year in timeseries_data.columns],
+        'series': {account: amounts for account, *amounts in source['rows']},
+        'trend_img_url': url_for('chart_image', chart_key=chart_key, kind='trend'),
+        'corp_name': corp_name,
+        'bsns_year': end_year
+    })
+
+# 차트 이미지 API (내용 해시 기반 URL이므로 영구 캐시 가능)
+@app.route('/charts/<chart_key>/<kind>.png', methods=['GET'])
+def chart_image(chart_key, kind):
+    if kind not in CHART_KINDS or not CHART_KEY_PATTERN.match(chart_key):
+        abort(404)
+    
+    etag = f"{chart_key}-{kind}"
+    cache_control = 'public, max-age=31536000, immutable'
+    
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        try:
+            image = get_chart_image(chart_key, kind)
+        except ChartQueueFull as e:
+            # 렌더링 대기열이 가득 차면 잠시 후 다시 요청하도록 안내 (캐시하지 않음)
+            logger.warning(str(e))
+            response = Response(status=503)
+            response.headers['Retry-After'] = '1'
+            return response
+        if not image:
+            abort(404)
+        response = Response(image, mimetype='image/png')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+# 캐시 통계 API
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        'financial_data': financial_cache.stats(),
+        'analysis': analysis_cache.stats(),
+        'singleflight': {
+            'financial_data': financial_flight.stats(),
+            'charts': chart_flight.stats()
+        },
+        'chart_pool': chart_pool.stats()
+    })
+
 # AI 재무 분석 API
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
@@ -474,29 +750,54 @@ def analyze():
         if not all([corp_code, corp_name, bsns_year, reprt_code]):
             return jsonify({'error': '모든 필수 항목을 입력해주세요.'})
         
-        financial_data = get_financial_data(corp_code, bsns_year, reprt_code)
+        statement = get_financial_statement(corp_code, bsns_year, reprt_code)
         
-        if not financial_data:
+        if statement is None:
             return jsonify({'error': '재무제표 데이터를 가져오는데 실패했습니다.'})
         
-        # AI 분석 실행 (fallback 포함)
-        analysis_result = analyze_financial_data(financial_data)
+        highlights = extract_financial_highlights(statement)
+        
+        if not highlights:
+            return jsonify({
+                'analysis': '재무 데이터를 분석할 수 없습니다.',
+                'corp_name': corp_name,
+                'bsns_year': bsns_year,
+                'note': '기본 재무 분석이 제공되었습니다.'
+            })
         
-        # 분석 결과가 오류 메시지인지 확인
-        if analysis_result and not analysis_result.startswith('재무 데이터를 분석할 수 없습니다'):
+        # 같은 재무 요약을 이미 분석했으면 바로 반환
+        prompt = build_analysis_prompt(highlights)
+        cached_analysis = get_cached_analysis(prompt)
+        if cached_analysis is not None:
             return jsonify({
-                'analysis': analysis_result,
+                'analysis': cached_analysis,
+                'cached': True,
                 'corp_name': corp_name,
                 'bsns_year': bsns_year
             })
-        else:
-            # fallback 분석이 제공된 경우
+        
+        # AI 분석은 백그라운드에서 실행하고 기본 분석을 먼저 반환 (결과는 job_id로 조회)
+        job = submit_analysis(prompt)
+        
+        if job is None:
+            # 대기열이 가득 찬 경우 기본 분석만 제공
             return jsonify({
-                'analysis': analysis_result,
+                'analysis': generate_fallback_analysis(highlights),
+                'cached': False,
                 'corp_name': corp_name,
                 'bsns_year': bsns_year,
-                'note': '기본 재무 분석이 제공되었습니다.'
+                'note': '요청이 많아 기본 재무 분석을 표시합니다. 잠시 후 다시 시도해주세요.'
             })
+        
+        return jsonify({
+            'analysis': generate_fallback_analysis(highlights),
+            'cached': False,
+            'job_id': job['id'],
+            'status': job['status'],
+            'corp_name': corp_name,
+            'bsns_year': bsns_year,
+            'note': '기본 재무 분석을 먼저 표시합니다. AI 분석이 끝나면 자동으로 바뀝니다.'
+        })
             
     except Exception as e:
         logger.error(f"AI 분석 API 오류: {e}")
@@ -506,5 +807,109 @@ def analyze():
             'bsns_year': bsns_year if 'bsns_year' in locals() else ''
         })
 
+# SSE 이벤트 문자열 생성
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+# 스트리밍 분석이 요청 수 제한으로 기다릴 수 있는 최대 시간 (초)
+STREAM_RATE_LIMIT_WAIT = 10
+
+# AI 재무 분석 스트리밍 API (Server-Sent Events)
+@app.route('/api/analyze/stream', methods=['GET'])
+def analyze_stream():
+    corp_code = request.args.get('corp_code')
+    corp_name = request.args.get('corp_name')
+    bsns_year = request.args.get('bsns_year')
+    reprt_code = request.args.get('reprt_code')
+    
+    if not all([corp_code, corp_name, bsns_year, reprt_code]):
+        return jsonify({'error': '모든 필수 항목을 입력해주세요.'}), 400
+    
+    statement = get_financial_statement(corp_code, bsns_year, reprt_code)
+    highlights = extract_financial_highlights(statement)
+    
+    def generate():
+        # 이벤트: chunk(분석 조각) / fallback(기본 분석) / fail(오류) / done(종료)
+        if statement is None:
+            yield sse_event('fail', {'error': '재무제표 데이터를 가져오는데 실패했습니다.'})
+            return
+        
+        if not highlights:
+            yield sse_event('fallback', {'analysis': '재무 데이터를 분석할 수 없습니다.'})
+            yield sse_event('done', {'cached': False})
+            return
+        
+        prompt = build_analysis_prompt(highlights)
+        cached_analysis = get_cached_analysis(prompt)
+        if cached_analysis is not None:
+            yield sse_event('chunk', {'text': cached_analysis})
+            yield sse_event('done', {'cached': True})
+            return
+        
+        # 분당 Gemini 요청 수 제한 (대기열 작업과 같은 제한 사용)
+        if not rate_limiter.acquire(timeout=STREAM_RATE_LIMIT_WAIT):
+            yield sse_event('fallback', {
+                'analysis': generate_fallback_analysis(highlights),
+                'note': '요청이 많아 기본 재무 분석을 표시합니다. 잠시 후 다시 시도해주세요.'
+            })
+            yield sse_event('done', {'cached': False})
+            return
+        
+        chunks = []
+        try:
+            for text in stream_analysis(prompt):
+                chunks.append(text)
+                yield sse_event('chunk', {'text': text})
+            if not chunks:
+                raise ValueError("빈 분석 결과")
+        except Exception as e:
+            logger.error(f"AI 분석 스트리밍 중 오류 발생: {e}")
+            yield sse_event('fallback', {
+                'analysis': generate_fallback_analysis(highlights),
+                'note': 'AI 분석을 가져오지 못해 기본 재무 분석을 표시합니다.'
+            })
+            yield sse_event('done', {'cached': False})
+            return
+        
+        cache_analysis(prompt, ''.join(chunks))
+        yield sse_event('done', {'cached': False})
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# AI 분석 작업 상태 API
+@app.route('/api/analyze/status/<job_id>', methods=['GET'])
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def analyze_status(job_id):
+    job = get_job(job_id)
+    
+    if job is None:
+        return jsonify({'error': '분석 작업을 찾을 수 없습니다. 다시 시도해주세요.'}), 404
+    
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'analysis': job['analysis'],
+        'attempts': job['attempts'],
+        'coalesced': job['coalesced'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    })
+
+# AI 분석 대기열 상태 API
+@app.route('/api/jobs', methods=['GET'])
+def jobs_status():
+    return jsonify(queue_stats())
+
+# 임포트 시간 확인 (무거운 라이브러리가 다시 시작 경로에 들어오면 경고)
+import_time = time.perf_counter() - _import_started
+if import_time > IMPORT_TIME_BUDGET:
+    logger.warning(f"app 임포트 시간 {import_time:.3f}초가 목표({IMPORT_TIME_BUDGET}초)를 넘었습니다.")
+else:
+    logger.info(f"app 임포트 시간: {import_time:.3f}초")
+
+# 개발 서버 (python app.py). 차트 렌더링 프로세스가 이 파일을 다시 임포트해도 서버는 띄우지 않도록 반드시 이 블록 안에서만 실행
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000))) 
\ No newline at end of file
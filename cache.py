@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    스레드 안전한 메모리 LRU 캐시입니다.
+    항목별 만료 시간(TTL)을 지원하며, 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteCache:
+    """
+    SQLite 파일에 JSON 값을 저장하는 디스크 캐시입니다.
+    프로세스가 재시작되어도 유지되며, max_entries를 넘으면 최근에 사용하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, db_path, table='cache', max_entries=None):
+        self.db_path = db_path
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL,
+            accessed_at REAL NOT NULL
+        )
+        ''')
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_accessed_at ON {table} (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+
+        return json.loads(value)
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, payload, expires_at, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def _evict(self, now):
+        # 만료된 항목 정리
+        self._conn.execute(f'DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+
+        # 최대 개수를 넘으면 최근에 사용하지 않은 항목부터 제거
+        if self.max_entries:
+            self._conn.execute(
+                f'''DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )''',
+                (self.max_entries,)
+            )
+
+
+class FileCache:
+    """
+    디렉터리에 바이너리 값을 파일로 저장하는 디스크 캐시입니다.
+    키의 '/'는 하위 디렉터리로 사용되며, max_entries를 넘으면 수정 시각이 오래된 파일부터 제거합니다.
+    """
+
+    def __init__(self, directory, suffix='', max_entries=None, prune_interval=100):
+        self.directory = directory
+        self.suffix = suffix
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, *key.split('/')) + self.suffix
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, value, ttl=None):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._writes += 1
+            should_prune = self.max_entries and self._writes % self.prune_interval == 0
+        if should_prune:
+            self._prune()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _prune(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if self.suffix and not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class TieredCache:
+    """
+    메모리 LRU 캐시를 디스크 캐시(SQLiteCache 또는 FileCache) 앞에 둔 2단계 캐시입니다.
+    디스크에서 찾은 값은 메모리로 올리며, 단계별 적중/실패 횟수를 집계합니다.
+    """
+
+    def __init__(self, name, memory, disk=None):
+        self.name = name
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'sets': 0}
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key, ttl=None, count=True):
+        """
+        메모리 -> 디스크 순으로 값을 찾습니다. 없으면 None을 반환합니다.
+        count가 False이면 적중/실패 횟수를 세지 않습니다. (이미 센 요청 안에서 다시 확인할 때)
+        """
+        value, counter = self._lookup(key, ttl)
+        if count:
+            self._count(counter)
+        return value
+
+    def _lookup(self, key, ttl):
+        value = self.memory.get(key)
+        if value is not None:
+            return value, 'memory_hits'
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"{self.name} 디스크 캐시 조회 실패: {e}")
+                value = None
+
+            if value is not None:
+                self.memory.set(key, value, ttl)
+                return value, 'disk_hits'
+
+        return None, 'misses'
+
+    def set(self, key, value, ttl=None):
+        self._count('sets')
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"{self.name} 디스크 캐시 저장 실패: {e}")
+
+    def delete(self, key):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+
+        hits = counters['memory_hits'] + counters['disk_hits']
+        lookups = hits + counters['misses']
+        counters['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        counters['memory_size'] = len(self.memory)
+        return counters
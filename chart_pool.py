@@ -0,0 +1,146 @@
+import os
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# 차트를 그리는 프로세스 수 (Agg 렌더링은 GIL을 잡으므로 스레드 대신 프로세스로 나눠 그림)
+# 프로세스마다 matplotlib과 차트 템플릿을 따로 올려 약 120MB를 쓰고, gunicorn 워커마다 풀을 따로 만들므로
+# 전체 메모리는 WEB_CONCURRENCY × CHART_PROCESSES개 프로세스만큼 늘어남. 그래서 기본값은 CPU 수(최대 2)로 작게 둠
+# 0이면 프로세스 풀 없이 요청 스레드에서 그림
+CHART_PROCESSES = int(os.getenv('CHART_PROCESSES', str(min(2, os.cpu_count() or 1))))
+
+# 풀에 넣을 수 있는 최대 렌더링 수 (실행 중 + 대기 중). 가득 차면 CHART_QUEUE_TIMEOUT초까지 기다림
+CHART_QUEUE_SIZE = int(os.getenv('CHART_QUEUE_SIZE', str(max(1, CHART_PROCESSES) * 4)))
+CHART_QUEUE_TIMEOUT = 10
+
+# 한 차트를 그리는 데 기다리는 최대 시간 (초)
+CHART_RENDER_TIMEOUT = 60
+
+
+class ChartQueueFull(Exception):
+    """렌더링 대기열이 가득 차 차트를 그리지 못했을 때 발생합니다. (잠시 후 다시 요청)"""
+
+
+_executor = None
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(CHART_QUEUE_SIZE)
+_in_use = 0
+
+
+def _init_worker():
+    # 워커 프로세스 시작 시 matplotlib 임포트, 폰트/스타일 설정, 차트 템플릿 생성을 미리 해 둠
+    import charts
+    charts.warm_templates()
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _render(kind, source):
+    import charts
+    return charts.render_chart(kind, charts.chart_rows(source), source['ratios'])
+
+
+def start():
+    """
+    차트 렌더링 프로세스 풀을 시작합니다. (이미 시작했으면 그대로 반환)
+    spawn 방식으로 워커를 띄우고 바로 초기화를 시작하므로, 첫 차트 요청 전에 호출해 두면 워커가 미리 준비됩니다.
+
+    Returns:
+        ProcessPoolExecutor. CHART_PROCESSES가 0이면 None
+    """
+    global _executor
+    if CHART_PROCESSES <= 0:
+        return None
+
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=CHART_PROCESSES,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+            # 워커는 첫 작업이 들어올 때 만들어지므로 빈 작업으로 모든 워커를 띄움
+            for _ in range(CHART_PROCESSES):
+                _executor.submit(_warm_up)
+            logger.info(f"차트 렌더링 프로세스 {CHART_PROCESSES}개 시작")
+        return _executor
+
+
+def _reset(executor):
+    # 워커가 비정상 종료되어 풀이 깨지면 다음 요청에서 새로 만듦
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def render(kind, source):
+    """
+    차트를 그려 PNG 바이트를 반환합니다. 프로세스 풀이 있으면 워커 프로세스에서 그립니다.
+
+    Args:
+        kind: 차트 종류 (charts.CHART_TEMPLATES의 키)
+        source: app.chart_source()로 만든 차트 원본
+
+    Returns:
+        PNG 바이트. 그릴 수 없는 데이터면 None
+
+    Raises:
+        ChartQueueFull: 대기열이 CHART_QUEUE_TIMEOUT초 동안 가득 차 있었던 경우
+    """
+    executor = start()
+    if executor is None:
+        return _render(kind, source)
+
+    try:
+        return _submit(executor, kind, source)
+    except BrokenProcessPool:
+        logger.error("차트 렌더링 프로세스 풀이 중단되어 다시 시작합니다.")
+        _reset(executor)
+        raise
+
+
+def _submit(executor, kind, source):
+    # 대기열(실행 중 + 대기 중)이 가득 차면 자리가 날 때까지 기다림 (backpressure)
+    if not _slots.acquire(timeout=CHART_QUEUE_TIMEOUT):
+        raise ChartQueueFull(f"차트 렌더링 대기열이 가득 찼습니다. ({CHART_QUEUE_SIZE}개)")
+
+    # 슬롯은 요청이 기다리기를 그만두더라도 워커가 실제로 끝났을 때 반납
+    _track(1)
+    try:
+        future = executor.submit(_render, kind, source)
+    except BaseException:
+        _release()
+        raise
+    future.add_done_callback(lambda _: _release())
+    return future.result(timeout=CHART_RENDER_TIMEOUT)
+
+
+def _track(delta):
+    global _in_use
+    with _lock:
+        _in_use += delta
+
+
+def _release():
+    _track(-1)
+    _slots.release()
+
+
+def stats():
+    """
+    렌더링 대기열 상태를 반환합니다.
+    """
+    return {
+        'processes': CHART_PROCESSES,
+        'started': _executor is not None,
+        'max_queued': CHART_QUEUE_SIZE,
+        'in_use': _in_use,
+    }
@@ -0,0 +1,445 @@
+# 차트 렌더링 (matplotlib/seaborn 임포트와 폰트 설정이 무거우므로 app.py에서 첫 차트를 그릴 때 임포트)
+import os
+import sys
+import abc
+import time
+import logging
+import threading
+from io import BytesIO
+import matplotlib
+# Matplotlib 백엔드를 'Agg'로 설정 (seaborn이 pyplot을 임포트하므로 그 전에 설정)
+matplotlib.use('Agg')
+import seaborn as sns
+import numpy as np
+import pandas as pd
+from matplotlib import font_manager, style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+from financial_data import BS_ACCOUNTS, BALANCE_ACCOUNTS, IS_ACCOUNTS
+from financial_metrics import RADAR_RATIOS, NOT_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+# 환경별 한글 폰트 후보 (앞에서부터 설치된 폰트를 사용, .ttf 경로는 폰트 파일을 직접 등록)
+if sys.platform == 'win32':
+    KOREAN_FONT_CANDIDATES = ['C:/Windows/Fonts/malgun.ttf', 'Malgun Gothic']
+elif sys.platform == 'darwin':
+    KOREAN_FONT_CANDIDATES = ['AppleGothic']
+else:
+    # 리눅스/Docker 환경은 Noto Sans CJK 폰트 사용
+    KOREAN_FONT_CANDIDATES = ['Noto Sans CJK KR', 'NanumGothic']
+FALLBACK_FONT = 'DejaVu Sans'
+
+# 한글 폰트 (init_chart_style()에서 한 번만 찾아 두고 렌더링 때 재사용)
+KOREAN_FONT = None
+_style_lock = threading.Lock()
+
+def find_korean_font():
+    """
+    설치된 한글 폰트를 찾아 FontProperties로 반환합니다. 없으면 DejaVu Sans를 사용합니다.
+    """
+    for candidate in KOREAN_FONT_CANDIDATES:
+        if candidate.endswith('.ttf'):
+            if not os.path.exists(candidate):
+                continue
+            font_manager.fontManager.addfont(candidate)
+            candidate = font_manager.FontProperties(fname=candidate).get_name()
+        
+        font = font_manager.FontProperties(family=candidate)
+        try:
+            font_manager.findfont(font, fallback_to_default=False)
+        except ValueError:
+            continue
+        return font
+    
+    logger.warning(f"한글 폰트를 찾지 못해 {FALLBACK_FONT} 폰트를 사용합니다.")
+    return font_manager.FontProperties(family=FALLBACK_FONT)
+
+# 한글 폰트 및 그래프 스타일 설정
+def init_chart_style():
+    """
+    한글 폰트와 그래프 스타일을 프로세스마다 한 번만 설정합니다. (이후 호출은 바로 반환)
+    폰트 캐시를 다시 만들지 않으므로 matplotlib의 폰트 검색 결과가 렌더링 간에 재사용됩니다.
+    
+    Returns:
+        한글 폰트 FontProperties
+    """
+    global KOREAN_FONT
+    with _style_lock:
+        if KOREAN_FONT is not None:
+            return KOREAN_FONT
+        
+        # 폰트 경고 무시 설정
+        import warnings
+        warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
+        
+        # 그래프 스타일 설정 (rcParams를 초기화하므로 폰트 설정보다 먼저 적용)
+        style.use('default')
+        sns.set_palette("husl")
+        
+        font = find_korean_font()
+        matplotlib.rcParams.update({
+            'font.family': font.get_family(),
+            'axes.unicode_minus': False,  # 마이너스 기호 표시 설정
+            # 폰트 크기 설정
+            'font.size': 10,
+            'axes.titlesize': 12,
+            'axes.labelsize': 10,
+            'xtick.labelsize': 9,
+            'ytick.labelsize': 9,
+            'legend.fontsize': 9,
+            'figure.titlesize': 14,
+        })
+        logger.info(f"차트 폰트: {font.get_name()}")
+        
+        KOREAN_FONT = font
+        return font
+
+def chart_rows(source):
+    """
+    app.chart_source()로 저장한 목록을 계정과목 인덱스의 금액표로 되돌립니다.
+    """
+    return pd.DataFrame(source['rows'], columns=['account_nm'] + source['columns']).set_index('account_nm')
+
+
+class ChartTemplate(abc.ABC):
+    """
+    차트 종류별 Figure 템플릿의 추상 기반 클래스입니다. pyplot 전역 상태 없이 Figure + FigureCanvasAgg로 그립니다.
+    Figure/축과 고정 요소(제목, 축 이름, 격자)는 setup()에서 한 번만 만들고,
+    요청마다 update()에서 데이터 요소(막대, 선, 값 표시)만 바꿉니다.
+    setup()과 update()를 모두 구현한 하위 클래스만 만들 수 있습니다.
+    템플릿 하나는 한 번에 한 스레드만 사용해야 합니다. (render_chart()의 템플릿 풀이 보장)
+    """
+    figsize = (10, 6)
+
+    def __init__(self):
+        self.figure = Figure(figsize=self.figsize, layout='tight')
+        FigureCanvasAgg(self.figure)
+        params = self.figure.subplotpars
+        self.subplot_params = {name: getattr(params, name) for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+        self.setup()
+
+    @abc.abstractmethod
+    def setup(self):
+        """
+        Figure에 축과 고정 요소를 만듭니다. (템플릿을 만들 때 한 번)
+        """
+
+    @abc.abstractmethod
+    def update(self, rows, ratios):
+        """
+        데이터 요소를 바꿉니다.
+        
+        Returns:
+            그릴 수 있으면 True, 필요한 계정이 없으면 False
+        """
+
+    def render(self, rows, ratios):
+        """
+        Returns:
+            PNG 바이트. 그릴 수 없는 데이터면 None
+        """
+        if not self.update(rows, ratios):
+            return None
+        # tight 레이아웃은 현재 여백에서 시작하므로 이전 요청의 결과가 남지 않도록 처음 여백으로 되돌림
+        self.figure.subplots_adjust(**self.subplot_params)
+        buf = BytesIO()
+        self.figure.savefig(buf, format='png', dpi=100)
+        return buf.getvalue()
+
+
+class BarChartTemplate(ChartTemplate):
+    """
+    계정과목별 당기/전기 막대그래프 (단위: 10억원)
+    하위 클래스에서 accounts(그릴 계정과목 목록)와 title을 정해야 만들 수 있습니다.
+    """
+    colors = ['#3498db', '#e74c3c']
+    bar_width = 0.25
+
+    @property
+    @abc.abstractmethod
+    def accounts(self):
+        pass
+
+    @property
+    @abc.abstractmethod
+    def title(self):
+        pass
+
+    def setup(self):
+        self.ax = self.figure.add_subplot()
+        self.ax.set_title(self.title, fontsize=16, fontweight='bold')
+        self.ax.set_ylabel('금액 (10억원)')
+        self.ax.grid(axis='y', linestyle='--', alpha=0.7)
+        self.artists = []
+
+    def update(self, rows, ratios):
+        data = rows[rows.index.isin(self.accounts)]
+        if data.empty:
+            return False
+        
+        # 10억 단위로 변환 (당기, 전기)
+        data = data / 1_000_000_000
+        
+        # 이전 요청의 막대와 값 표시 제거
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+        
+        ax = self.ax
+        positions = np.arange(len(data.index))
+        offsets = (np.arange(len(data.columns)) - (len(data.columns) - 1) / 2) * self.bar_width
+        for offset, color, period in zip(offsets, self.colors, data.columns):
+            bars = ax.bar(positions + offset, data[period].values, self.bar_width, color=color, label=period)
+            self.artists.append(bars)
+            # 값 표시
+            self.artists.extend(ax.bar_label(bars, fmt='%.1f'))
+        
+        ax.set_xticks(positions)
+        ax.set_xticklabels(data.index)
+        ax.set_xlim(-0.5, len(positions) - 0.5)
+        ax.relim()
+        ax.autoscale_view()
+        ax.legend()
+        return True
+
+
+# 1. 재무상태표 시각화 (당기, 전기만)
+class BalanceSheetChart(BarChartTemplate):
+    accounts = BS_ACCOUNTS
+    title = '재무상태표 (단위: 10억원)'
+
+
+# 3. 손익계산서 시각화 (당기, 전기만)
+class IncomeStatementChart(BarChartTemplate):
+    accounts = IS_ACCOUNTS
+    title = '손익계산서 (단위: 10억원)'
+
+
+# 2. 자산 = 부채 + 자본 관계 시각화 (텍스트 기반)
+class BalanceIdentityChart(ChartTemplate):
+    figsize = (12, 8)
+
+    def setup(self):
+        ax = self.ax = self.figure.add_subplot()
+        ax.axis('off')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        
+        # 배경 박스 그리기
+        ax.add_patch(Rectangle((0.1, 0.1), 0.8, 0.8, linewidth=3, edgecolor='#2c3e50', facecolor='none'))
+        
+        # 제목, 자산(왼쪽) / 부채 + 자본(오른쪽) 제목, 등호
+        text_style = dict(ha='center', va='center', fontweight='bold')
+        ax.text(0.5, 0.95, '자산 = 부채 + 자본', fontsize=20, color='#2c3e50', **text_style)
+        ax.text(0.25, 0.75, '자산', fontsize=16, color='#2c3e50', **text_style)
+        ax.text(0.75, 0.75, '부채 + 자본', fontsize=16, color='#2c3e50', **text_style)
+        ax.text(0.5, 0.25, '=', fontsize=24, color='#e74c3c', **text_style)
+        
+        # 금액 표시 (요청마다 글자만 바꿈): (x, y, 글자 크기, 색상, 형식)
+        labels = [
+            (0.25, 0.65, 14, '#2c3e50', '{assets:,}억원'),
+            (0.25, 0.55, 12, '#3498db', '유동자산: {current_assets:,}억원'),
+            (0.25, 0.45, 12, '#e74c3c', '비유동자산: {non_current_assets:,}억원'),
+            (0.75, 0.65, 14, '#2c3e50', '{liabilities_equity:,}억원'),
+            (0.75, 0.55, 12, '#f39c12', '유동부채: {current_liabilities:,}억원'),
+            (0.75, 0.45, 12, '#9b59b6', '비유동부채: {non_current_liabilities:,}억원'),
+            (0.75, 0.35, 12, '#27ae60', '자본: {equity:,}억원'),
+        ]
+        self.labels = [
+            (ax.text(x, y, '', fontsize=fontsize, ha='center', va='center', color=color), fmt)
+            for x, y, fontsize, color, fmt in labels
+        ]
+        
+        # 검증 메시지
+        self.check_text = ax.text(0.5, 0.15, '', fontsize=12, **text_style)
+
+    def update(self, rows, ratios):
+        balance_data = rows.loc[rows.index.isin(BALANCE_ACCOUNTS), '당기']
+        if not set(BS_ACCOUNTS) <= set(balance_data.index):
+            return False
+        
+        # 당기 데이터 추출 (10억원 단위, 반올림)
+        amounts = {account: round(float(amount) / 1_000_000_000) for account, amount in balance_data.items()}
+        values = {
+            'assets': amounts['자산총계'],
+            'liabilities': amounts['부채총계'],
+            'equity': amounts['자본총계'],
+            'current_assets': amounts.get('유동자산', 0),
+            'non_current_assets': amounts.get('비유동자산', 0),
+            'current_liabilities': amounts.get('유동부채', 0),
+            'non_current_liabilities': amounts.get('비유동부채', 0),
+        }
+        values['liabilities_equity'] = values['liabilities'] + values['equity']
+        
+        for text, fmt in self.labels:
+            text.set_text(fmt.format(**values))
+        
+        difference = abs(values['assets'] - values['liabilities_equity'])
+        if difference < 1:  # 1억원 이내 차이
+            self.check_text.set_text('✓ 자산 = 부채 + 자본 (균형)')
+            self.check_text.set_color('#27ae60')
+        else:
+            self.check_text.set_text(f'⚠ 차이: {difference:,.0f}억원')
+            self.check_text.set_color('#e74c3c')
+        return True
+
+
+# 4. 주요 재무비율 시각화 (5각형 레이더 차트)
+class RatioRadarChart(ChartTemplate):
+    figsize = (10, 8)
+
+    def setup(self):
+        ax = self.ax = self.figure.add_subplot(projection='polar')
+        categories = [label for label, _ in RADAR_RATIOS]
+        
+        # 각도 계산 (첫 번째 각도를 마지막에 추가하여 닫힌 도형 만들기)
+        self.angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+        closed_angles = self.angles + self.angles[:1]
+        zeros = [0] * len(closed_angles)
+        self.line, = ax.plot(closed_angles, zeros, 'o-', linewidth=2, color='#3498db')
+        self.area, = ax.fill(closed_angles, zeros, alpha=0.25, color='#3498db')
+        
+        # 축 레이블, 그리드, 제목
+        ax.set_xticks(self.angles)
+        ax.set_xticklabels(categories)
+        ax.grid(True)
+        ax.set_title('주요 재무비율 (5각형 레이더 차트)', fontsize=16, fontweight='bold', pad=20)
+        
+        # 값 표시
+        self.value_texts = [
+            ax.text(angle, 0, '', ha='center', va='center', fontweight='bold') for angle in self.angles
+        ]
+
+    def update(self, rows, ratios):
+        if not set(BS_ACCOUNTS + IS_ACCOUNTS) <= set(rows.index):
+            return False
+        
+        # 분모가 0 이하라 계산하지 않은 비율은 중심에 두고 N/A로 표시
+        ratio_values = [ratios.get(name) for _, name in RADAR_RATIOS]
+        values = [value if value is not None else 0 for value in ratio_values]
+        closed_values = values + values[:1]
+        self.line.set_ydata(closed_values)
+        self.area.set_xy(np.column_stack([self.angles + self.angles[:1], closed_values]))
+        
+        offset = max(values) * 0.1
+        for text, angle, value, ratio in zip(self.value_texts, self.angles, values, ratio_values):
+            text.set_position((angle, value + offset))
+            text.set_text(f'{value:.1f}%' if ratio is not None else NOT_AVAILABLE)
+        
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
+
+
+# 5. 연도별 추이 (재무상태표/손익계산서 계정을 위아래로 나누어 표시)
+class TrendChart(ChartTemplate):
+    figsize = (12, 9)
+    panels = [
+        (BS_ACCOUNTS, '재무상태표 추이 (단위: 10억원)'),
+        (IS_ACCOUNTS, '손익계산서 추이 (단위: 10억원)'),
+    ]
+
+    def setup(self):
+        self.axes = self.figure.subplots(2, 1, sharex=True)
+        for ax, (accounts, title) in zip(self.axes, self.panels):
+            ax.set_title(title, fontsize=14, fontweight='bold')
+            ax.set_ylabel('금액 (10억원)')
+            ax.grid(axis='y', linestyle='--', alpha=0.7)
+            ax.axhline(0, color='#7f8c8d', linewidth=0.8)
+        self.axes[-1].set_xlabel('사업연도')
+        self.lines = []
+
+    def update(self, rows, ratios):
+        # 10억 단위로 변환 (계정과목별 선, x축은 연도). 모든 연도가 빈 값(None)인 계정은 그리지 않음
+        trend_data = (rows.astype('float64') / 1_000_000_000).dropna(how='all')
+        if not any(account in trend_data.index for accounts, _ in self.panels for account in accounts):
+            return False
+        
+        # 이전 요청의 선 제거
+        for line in self.lines:
+            line.remove()
+        self.lines = []
+        
+        positions = np.arange(len(trend_data.columns))
+        
+        for ax, (accounts, title) in zip(self.axes, self.panels):
+            present = [account for account in accounts if account in trend_data.index]
+            if present:
+                ax.set_axis_on()
+            else:
+                ax.set_axis_off()
+            ax.title.set_visible(bool(present))
+            if ax.legend_ is not None:
+                ax.legend_.remove()
+            if not present:
+                continue
+            
+            # 선 색상이 요청마다 같도록 색상 순환을 처음부터 다시 시작
+            ax.set_prop_cycle(None)
+            for account in present:
+                line, = ax.plot(positions, trend_data.loc[account].values, marker='o', linewidth=2, label=account)
+                self.lines.append(line)
+            ax.legend()
+            ax.relim()
+            ax.autoscale_view()
+        
+        self.axes[-1].set_xticks(positions)
+        self.axes[-1].set_xticklabels(trend_data.columns)
+        return True
+
+
+CHART_TEMPLATES = {
+    'bs': BalanceSheetChart,
+    'balance': BalanceIdentityChart,
+    'is': IncomeStatementChart,
+    'ratio': RatioRadarChart,
+    'trend': TrendChart,
+}
+
+# 차트 종류별로 쉬고 있는 템플릿 (동시에 그리는 차트 수만큼만 만들어짐)
+_template_pool = {kind: [] for kind in CHART_TEMPLATES}
+_pool_lock = threading.Lock()
+
+def warm_templates():
+    """
+    종류별 템플릿을 하나씩 미리 만들고 한 번 그려 둡니다. (폰트 로딩 등 첫 렌더링 비용을 요청 전에 처리)
+    """
+    for kind, template_class in CHART_TEMPLATES.items():
+        template = template_class()
+        template.figure.canvas.draw()
+        with _pool_lock:
+            _template_pool[kind].append(template)
+
+def render_chart(kind, rows, ratios):
+    """
+    템플릿 풀에서 해당 종류의 Figure를 꺼내 차트를 그립니다. 여러 스레드에서 동시에 호출해도 됩니다.
+    
+    Args:
+        kind: CHART_TEMPLATES의 차트 종류
+        rows: chart_rows()로 만든 계정 금액표
+        ratios: 재무비율 딕셔너리 (레이더 차트용)
+        
+    Returns:
+        PNG 바이트. 그릴 수 없는 데이터면 None
+    """
+    if kind not in CHART_TEMPLATES:
+        raise ValueError(f"알 수 없는 차트 종류: {kind}")
+    
+    pool = _template_pool[kind]
+    with _pool_lock:
+        template = pool.pop() if pool else None
+    if template is None:
+        template = CHART_TEMPLATES[kind]()
+    
+    # 그리는 도중 오류가 나면 상태를 알 수 없으므로 템플릿을 풀에 돌려놓지 않음
+    image = template.render(rows, ratios)
+    with _pool_lock:
+        pool.append(template)
+    return image
+
+# 한글 폰트 및 스타일 설정 실행 (모듈을 처음 임포트할 때 한 번)
+_font_started = time.perf_counter()
+init_chart_style()
+logger.info(f"차트 모듈 초기화: {time.perf_counter() - _font_started:.3f}초")
@@ -1,101 +1,611 @@
 import os
+import re
 import json
+import time
 import sqlite3
+import threading
+from pathlib import Path
+from functools import lru_cache
+from itertools import islice
 from dotenv import load_dotenv
+from korean_text import to_chosung, roman_key, is_chosung_query, is_latin_query
 
-def create_database():
+# 데이터베이스 파일 경로
+DB_PATH = 'corp_codes.db'
+
+# 일괄 적재 시 한 번에 삽입할 행 수
+BULK_BATCH_SIZE = 5000
+
+# 검색용 읽기 전용 연결 설정
+READ_CACHE_SIZE_KB = 16 * 1024
+READ_MMAP_SIZE = 256 * 1024 * 1024
+READ_CACHED_STATEMENTS = 128
+
+# 전체 갱신 시 기존 데이터베이스에 백업으로 덮어쓸 때 한 번에 복사할 페이지 수와 최대 대기 시간 (초)
+BACKUP_PAGES = 1024
+BACKUP_TIMEOUT = 30
+
+# 스레드별 읽기 전용 연결
+_local = threading.local()
+
+# 데이터베이스를 다시 만들면 증가시켜 기존 연결을 다시 열도록 함
+_generation = 0
+
+COMPANIES_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    corp_code TEXT NOT NULL UNIQUE,
+    corp_name TEXT NOT NULL,
+    stock_code TEXT,
+    modify_date TEXT,
+    corp_name_chosung TEXT,
+    corp_name_roman TEXT
+)
+'''
+
+COMPANIES_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_corp_name ON companies (corp_name)',
+    'CREATE INDEX IF NOT EXISTS idx_stock_code ON companies (stock_code)',
+    'CREATE INDEX IF NOT EXISTS idx_corp_name_chosung ON companies (corp_name_chosung)',
+    'CREATE INDEX IF NOT EXISTS idx_corp_name_roman ON companies (corp_name_roman)',
+]
+
+# 동기화 메타데이터 (modify_date 기준일 등)
+SYNC_META_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sync_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+)
+'''
+
+# 마지막으로 반영한 modify_date
+WATERMARK_KEY = 'modify_date_watermark'
+
+INSERT_COMPANY_SQL = '''
+INSERT INTO companies (corp_code, corp_name, stock_code, modify_date, corp_name_chosung, corp_name_roman)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# JSON 배열 항목 사이의 공백과 쉼표
+JSON_SEPARATOR_PATTERN = re.compile(r'[\s,]*')
+
+def iter_json_array(path, chunk_size=64 * 1024):
     """
-    corp_codes.json 파일에서 회사 정보를 읽어 SQLite 데이터베이스를 생성합니다.
+    JSON 배열 파일을 전체를 메모리에 올리지 않고 항목 단위로 읽습니다.
+    
+    Args:
+        path: JSON 파일 경로 (최상위가 배열이어야 함)
+        chunk_size: 한 번에 읽을 문자 수
+        
+    Returns:
+        배열 항목을 하나씩 돌려주는 제너레이터
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path}: JSON 배열 형식이 아닙니다.")
+        pos = 1
+        
+        while True:
+            pos = JSON_SEPARATOR_PATTERN.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+            
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 항목이 읽은 범위를 넘어가면 다음 조각을 이어 붙여 다시 시도
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            
+            yield item
+            pos = end
+
+def company_row(company):
+    """
+    회사 정보를 companies 테이블 행으로 변환합니다. (초성/로마자 검색 컬럼 포함)
+    """
+    corp_name = company.get('corp_name') or ''
+    return (
+        company.get('corp_code', ''),
+        corp_name,
+        company.get('stock_code', ''),
+        company.get('modify_date', ''),
+        to_chosung(corp_name),
+        roman_key(corp_name)
+    )
+
+def set_sync_meta(conn, key, value):
+    conn.execute('INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)', (key, value))
+
+def get_sync_meta(conn, key):
+    row = conn.execute('SELECT value FROM sync_meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else None
+
+def backup_database(conn, db_path, pages=BACKUP_PAGES, timeout=BACKUP_TIMEOUT):
+    """
+    conn의 데이터베이스를 db_path에 SQLite 백업 API로 덮어씁니다. (한 쓰기 트랜잭션으로 바뀌므로 읽는 쪽은 이전/새 데이터 중 하나만 봄)
+    
+    Connection.backup()은 대상이 잠겨 있으면(SQLITE_BUSY/LOCKED) 끝없이 다시 시도하므로,
+    pages 단위로 복사하면서 timeout초가 지나면 중단합니다. (다른 연결이 쓰기 트랜잭션을 오래 잡고 있는 경우)
+    
+    Raises:
+        TimeoutError: timeout초 안에 복사를 끝내지 못한 경우 (기존 데이터베이스는 그대로 유지)
+    """
+    deadline = time.monotonic() + timeout
+    
+    def check_deadline(status, remaining, total):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{db_path}: {timeout}초 안에 데이터베이스를 교체하지 못했습니다. (다른 연결이 쓰기 중)")
+    
+    # 잠금 대기는 단계마다 짧게 하고 전체 대기 시간은 deadline으로 제한
+    live = sqlite3.connect(db_path, timeout=1)
+    try:
+        conn.backup(live, pages=pages, progress=check_deadline)
+    finally:
+        live.close()
+
+def bulk_load(companies, db_path=DB_PATH, batch_size=BULK_BATCH_SIZE):
+    """
+    회사 정보를 임시 파일에 일괄 적재한 뒤 데이터베이스를 원자적으로 교체합니다.
+    실행 중인 앱은 교체 전까지 기존 데이터베이스를 그대로 읽으므로 만들다 만 데이터베이스를 보지 않습니다.
+    
+    기존 데이터베이스가 없으면 임시 파일을 그대로 옮기고, 있으면 SQLite 백업 API로 한 트랜잭션에 덮어씁니다.
+    (WAL 파일은 경로로 연결되므로 WAL 모드 데이터베이스 파일을 다른 파일로 바꿔치기하면 안 됨)
+    
+    Args:
+        companies: 회사 정보(dict)를 돌려주는 iterable (스트리밍 가능)
+        db_path: 생성할 데이터베이스 파일 경로
+        batch_size: executemany 한 번에 삽입할 행 수
+        
+    Returns:
+        저장된 회사 수
     """
-    # 데이터베이스 파일 경로
-    db_path = 'corp_codes.db'
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
     
-    # 이미 존재하는 경우 기존 DB 삭제
+    # 트랜잭션을 직접 관리
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        # 새로 만드는 임시 파일이므로 저널/동기화 없이 빠르게 적재 (실패 시 파일을 버림)
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('PRAGMA locking_mode = EXCLUSIVE')
+        conn.execute('PRAGMA cache_size = -65536')
+        
+        conn.execute('BEGIN')
+        conn.execute(COMPANIES_SCHEMA)
+        conn.execute(SYNC_META_SCHEMA)
+        
+        # 데이터 삽입 (batch_size 단위 executemany)
+        count = 0
+        watermark = ''
+        rows = (company_row(company) for company in companies)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            conn.executemany(INSERT_COMPANY_SQL, batch)
+            count += len(batch)
+            watermark = max([watermark] + [row[3] or '' for row in batch])
+        
+        # 인덱스는 적재가 끝난 뒤 한 번에 생성
+        for statement in COMPANIES_INDEXES:
+            conn.execute(statement)
+        build_search_index(conn.cursor())
+        
+        # 이후 증분 동기화 기준일 기록
+        set_sync_meta(conn, WATERMARK_KEY, watermark)
+        set_sync_meta(conn, 'last_full_load_at', time.strftime('%Y-%m-%d %H:%M:%S'))
+        
+        conn.execute('COMMIT')
+        
+        # 증분 동기화 중에도 검색이 막히지 않도록 WAL 모드로 전환 (파일에 유지됨)
+        conn.execute('PRAGMA locking_mode = NORMAL')
+        conn.execute('PRAGMA journal_mode = WAL')
+        
+        if os.path.exists(db_path):
+            backup_database(conn, db_path)
+    except Exception:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    
+    conn.close()
     if os.path.exists(db_path):
-        os.remove(db_path)
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, db_path)
+    return count
+
+def create_database(json_path='corp_codes.json'):
+    """
+    corp_codes.json 파일에서 회사 정보를 읽어 SQLite 데이터베이스를 생성합니다.
+    JSON은 스트리밍으로 읽고, 완성된 데이터베이스로 기존 파일을 교체합니다. (실패 시 기존 파일 유지)
+    """
+    global _generation
+    
+    try:
+        count = bulk_load(iter_json_array(json_path))
+        _generation += 1
+        print(f"데이터베이스 생성 완료: {count}개 회사 정보가 저장되었습니다.")
     
-    # 데이터베이스 연결
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    except Exception as e:
+        print(f"데이터베이스 생성 중 오류 발생: {e}")
+
+def get_read_connection():
+    """
+    현재 스레드의 읽기 전용 연결을 반환합니다. (없으면 새로 연결)
+    
+    연결은 스레드마다 하나씩 재사용되며, mode=ro URI로 열어 쓰기 잠금을 잡지 않습니다.
+    mmap과 페이지 캐시를 키우고, 같은 SQL은 연결의 prepared statement 캐시를 재사용합니다.
+    전체 갱신(bulk_load)과 증분 동기화는 기존 파일 안에서 트랜잭션으로 바꾸므로, 다른 프로세스의 연결도
+    다시 열지 않고 다음 조회부터 새 데이터를 봅니다. (파일을 옮기는 것은 데이터베이스가 없을 때뿐)
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.generation == _generation:
+        return conn
+    
+    if conn is not None:
+        conn.close()
+    
+    uri = Path(os.path.abspath(DB_PATH)).as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, cached_statements=READ_CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row  # 결과를 딕셔너리 형태로 반환
+    conn.execute('PRAGMA query_only = ON')
+    conn.execute(f'PRAGMA mmap_size = {READ_MMAP_SIZE}')
+    conn.execute(f'PRAGMA cache_size = -{READ_CACHE_SIZE_KB}')
+    
+    _local.conn = conn
+    _local.generation = _generation
+    return conn
+
+def name_bigrams(name):
+    """
+    문자열의 2글자 조각 집합을 반환합니다. (공백이 포함된 조각 제외, 영문은 소문자로 통일)
+    """
+    name = name.lower()
+    return {name[i:i + 2] for i in range(len(name) - 1) if ' ' not in name[i:i + 2]}
+
+def company_bigrams(corp_name, chosung):
+    """
+    회사명과 초성의 2-gram 집합을 반환합니다. (company_bigrams 테이블용)
+    """
+    return name_bigrams(corp_name) | name_bigrams(chosung or '')
+
+def build_search_index(cursor):
+    """
+    회사명 부분 검색용 인덱스를 생성합니다.
+    - companies_fts: 3글자 이상 검색어용 FTS5 trigram 인덱스 (회사명, 초성, 로마자)
+    - company_bigrams: 2글자 검색어용 2-gram 인덱스 (회사명, 초성)
+    """
+    cursor.execute('DROP TABLE IF EXISTS companies_fts')
+    cursor.execute('''
+    CREATE VIRTUAL TABLE companies_fts USING fts5(
+        corp_name,
+        corp_name_chosung,
+        corp_name_roman,
+        content='companies',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    ''')
+    cursor.execute("INSERT INTO companies_fts (companies_fts) VALUES ('rebuild')")
     
-    # 테이블 생성
+    cursor.execute('DROP TABLE IF EXISTS company_bigrams')
     cursor.execute('''
-    CREATE TABLE IF NOT EXISTS companies (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        corp_code TEXT NOT NULL UNIQUE,
-        corp_name TEXT NOT NULL,
-        stock_code TEXT,
-        modify_date TEXT
+    CREATE TABLE company_bigrams (
+        gram TEXT NOT NULL,
+        company_id INTEGER NOT NULL
     )
     ''')
+    cursor.executemany(
+        'INSERT INTO company_bigrams (gram, company_id) VALUES (?, ?)',
+        (
+            (gram, company_id)
+            for company_id, corp_name, chosung in cursor.connection.execute('SELECT id, corp_name, corp_name_chosung FROM companies')
+            for gram in company_bigrams(corp_name, chosung)
+        )
+    )
+    # 적재 후 인덱스를 만드는 편이 정렬되지 않은 삽입보다 빠름
+    cursor.execute('CREATE INDEX idx_company_bigrams ON company_bigrams (gram, company_id)')
+
+def upsert_company(conn, company):
+    """
+    회사 한 건을 추가하거나 갱신하고 검색 인덱스(FTS, 2-gram)도 함께 고칩니다.
     
-    # 인덱스 생성
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_corp_name ON companies (corp_name)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_code ON companies (stock_code)')
+    Returns:
+        변경 여부 (내용이 같으면 False)
+    """
+    row = company_row(company)
+    existing = conn.execute(
+        'SELECT id, corp_name, stock_code, modify_date, corp_name_chosung, corp_name_roman FROM companies WHERE corp_code = ?',
+        (row[0],)
+    ).fetchone()
     
-    try:
-        # JSON 파일 로드
-        with open('corp_codes.json', 'r', encoding='utf-8') as f:
-            corp_codes = json.load(f)
-        
-        # 데이터 삽입
-        for company in corp_codes:
-            cursor.execute(
-                'INSERT INTO companies (corp_code, corp_name, stock_code, modify_date) VALUES (?, ?, ?, ?)',
-                (
-                    company.get('corp_code', ''),
-                    company.get('corp_name', ''),
-                    company.get('stock_code', ''),
-                    company.get('modify_date', '')
-                )
-            )
-        
-        # 변경사항 저장
-        conn.commit()
-        print(f"데이터베이스 생성 완료: {len(corp_codes)}개 회사 정보가 저장되었습니다.")
+    if existing is not None and tuple(existing[1:]) == row[1:]:
+        return False
     
-    except Exception as e:
-        print(f"데이터베이스 생성 중 오류 발생: {e}")
-        conn.rollback()
+    if existing is not None:
+        company_id, old_name, _, _, old_chosung, old_roman = existing
+        
+        # 외부 콘텐츠 FTS 테이블은 이전 값으로 'delete' 명령을 보내야 함
+        conn.execute(
+            "INSERT INTO companies_fts (companies_fts, rowid, corp_name, corp_name_chosung, corp_name_roman) VALUES ('delete', ?, ?, ?, ?)",
+            (company_id, old_name, old_chosung, old_roman)
+        )
+        conn.executemany(
+            'DELETE FROM company_bigrams WHERE gram = ? AND company_id = ?',
+            [(gram, company_id) for gram in company_bigrams(old_name, old_chosung)]
+        )
+        conn.execute(
+            'UPDATE companies SET corp_name = ?, stock_code = ?, modify_date = ?, corp_name_chosung = ?, corp_name_roman = ? WHERE id = ?',
+            row[1:] + (company_id,)
+        )
+    else:
+        company_id = conn.execute(INSERT_COMPANY_SQL, row).lastrowid
+    
+    corp_name, chosung, roman = row[1], row[4], row[5]
+    conn.execute(
+        'INSERT INTO companies_fts (rowid, corp_name, corp_name_chosung, corp_name_roman) VALUES (?, ?, ?, ?)',
+        (company_id, corp_name, chosung, roman)
+    )
+    conn.executemany(
+        'INSERT INTO company_bigrams (gram, company_id) VALUES (?, ?)',
+        [(gram, company_id) for gram in company_bigrams(corp_name, chosung)]
+    )
+    return True
+
+def sync_companies(companies, db_path=DB_PATH, batch_size=BULK_BATCH_SIZE):
+    """
+    마지막 동기화 기준일(modify_date watermark) 이후 변경된 회사만 기존 데이터베이스에 반영합니다.
     
+    WAL 모드에서 짧은 트랜잭션(batch_size 단위)으로 쓰므로 실행 중인 앱의 검색을 막지 않습니다.
+    modify_date는 날짜 단위라서 기준일 당일 변경분은 다음 동기화 때 다시 비교합니다. (내용이 같으면 건너뜀)
+    
+    Args:
+        companies: 전체 회사 정보(dict)를 돌려주는 iterable
+        db_path: 갱신할 데이터베이스 파일 경로
+        batch_size: 한 트랜잭션에서 반영할 최대 회사 수
+        
+    Returns:
+        (변경된 회사 수, 새 기준일)
+    """
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {'companies', 'companies_fts', 'company_bigrams', 'sync_meta'} <= tables:
+            raise RuntimeError("증분 동기화를 지원하지 않는 데이터베이스입니다. 전체 갱신을 먼저 실행하세요.")
+        
+        watermark = get_sync_meta(conn, WATERMARK_KEY) or ''
+        new_watermark = watermark
+        changed = (
+            company for company in companies
+            if (company.get('modify_date') or '') >= watermark
+        )
+        
+        count = 0
+        while True:
+            batch = list(islice(changed, batch_size))
+            if not batch:
+                break
+            
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                for company in batch:
+                    if upsert_company(conn, company):
+                        count += 1
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            
+            new_watermark = max([new_watermark] + [company.get('modify_date') or '' for company in batch])
+        
+        # 모든 변경을 반영한 뒤에 기준일 갱신 (중간에 실패하면 다음 실행에서 다시 반영)
+        conn.execute('BEGIN IMMEDIATE')
+        set_sync_meta(conn, WATERMARK_KEY, new_watermark)
+        set_sync_meta(conn, 'last_sync_at', time.strftime('%Y-%m-%d %H:%M:%S'))
+        conn.execute('COMMIT')
+        
+        return count, new_watermark
     finally:
-        # 연결 종료
         conn.close()
 
+# 검색 컬럼별 비교식 (회사명은 영문 대소문자 구분 없이 비교)
+SEARCH_COLUMNS = {
+    'corp_name': 'lower(c.corp_name)',
+    'corp_name_chosung': 'c.corp_name_chosung',
+    'corp_name_roman': 'c.corp_name_roman',
+}
+
+# 종목코드(앞자리) 또는 고유번호로 검색
+SEARCH_STOCK_CODE_SQL = '''
+    SELECT c.* FROM companies c
+    WHERE (c.stock_code >= :query AND c.stock_code < :query_end) OR c.corp_code = :query
+    ORDER BY c.corp_code = :query DESC, c.stock_code
+    LIMIT :limit
+'''
+
+# 1글자: 접두어 일치 결과가 limit보다 적으면 회사명 중간에 들어간 경우를 뒤에 이어 붙임 (전체 검색)
+SEARCH_SUBSTRING_SQL = '''
+    SELECT * FROM companies WHERE instr(lower(corp_name), :query) > 1
+    ORDER BY CASE WHEN stock_code IS NOT NULL AND stock_code != '' THEN 0 ELSE 1 END, corp_name
+    LIMIT :limit
+'''
+
+# 검색 인덱스가 없는 기존 데이터베이스용
+SEARCH_LIKE_SQL = '''
+    SELECT * FROM companies WHERE corp_name LIKE :like
+    ORDER BY CASE WHEN stock_code IS NOT NULL AND stock_code != '' THEN 0 ELSE 1 END, corp_name
+    LIMIT :limit
+'''
+
+def search_terms(query):
+    """
+    검색어를 (검색 컬럼, 비교할 문자열) 목록으로 바꿉니다.
+    - 초성 검색어: 초성 컬럼 ('ㅅㅅㅈㅈ')
+    - 영문 검색어: 회사명 + 로마자 컬럼 ('samsung', 'LG')
+    - 그 외: 회사명 컬럼
+    """
+    if is_chosung_query(query):
+        return [('corp_name_chosung', ''.join(query.split()))]
+    
+    terms = [('corp_name', query.lower())]
+    if is_latin_query(query):
+        key = roman_key(query)
+        if key:
+            terms.append(('corp_name_roman', key))
+    return terms
+
+@lru_cache(maxsize=64)
+def build_search_sql(mode, columns):
+    """
+    검색 방식과 검색 컬럼에 맞는 SQL을 만듭니다.
+    - fts: 3글자 이상, FTS5 trigram 부분 일치
+    - bigram: 2글자, 2-gram 인덱스 부분 일치
+    - prefix: 1글자, 컬럼 인덱스 접두어 검색 (부분 일치는 search_companies()에서 SEARCH_SUBSTRING_SQL로 이어 붙임)
+    
+    정렬: 정확히 일치 > 상장사 > 접두어 일치 > 회사명 순
+    """
+    if mode == 'fts':
+        source = 'companies_fts f JOIN companies c ON c.id = f.rowid'
+        where = 'companies_fts MATCH :match'
+    elif mode == 'bigram':
+        source = 'company_bigrams g JOIN companies c ON c.id = g.company_id'
+        where = 'g.gram IN ({})'.format(', '.join(f':t{i}' for i in range(len(columns))))
+    else:
+        source = 'companies c'
+        where = ' OR '.join(f'(c.{column} >= :t{i} AND c.{column} < :t{i}_end)' for i, column in enumerate(columns))
+    
+    exact = ' OR '.join(f'{SEARCH_COLUMNS[column]} = :t{i}' for i, column in enumerate(columns))
+    prefix = ' OR '.join(f'substr({SEARCH_COLUMNS[column]}, 1, length(:t{i})) = :t{i}' for i, column in enumerate(columns))
+    distinct = 'DISTINCT ' if mode == 'bigram' and len(columns) > 1 else ''
+    
+    return f'''
+    SELECT {distinct}c.* FROM {source}
+    WHERE {where}
+    ORDER BY
+        ({exact}) DESC,
+        CASE WHEN c.stock_code IS NOT NULL AND c.stock_code != '' THEN 0 ELSE 1 END,
+        ({prefix}) DESC,
+        c.corp_name
+    LIMIT :limit
+    '''
+
+def build_search_query(query, limit):
+    """
+    검색어로 실행할 (SQL, 파라미터)를 만듭니다.
+    """
+    terms = search_terms(query)
+    length = len(terms[0][1])
+    
+    if length >= 3:
+        mode = 'fts'
+        terms = [(column, term) for column, term in terms if len(term) >= 3]
+    elif length == 2:
+        mode = 'bigram'
+        terms = [(column, term) for column, term in terms if len(term) == 2 and column != 'corp_name_roman']
+    else:
+        mode = 'prefix'
+        # 접두어 검색은 인덱스를 타도록 입력한 그대로 비교
+        terms = [(column, query if column == 'corp_name' else term) for column, term in terms]
+    
+    params = {'limit': limit}
+    for i, (_, term) in enumerate(terms):
+        params[f't{i}'] = term
+        params[f't{i}_end'] = term + '\U0010ffff'
+    params['match'] = ' OR '.join(
+        '{} : "{}"'.format(column, term.replace('"', '""')) for column, term in terms
+    )
+    
+    return build_search_sql(mode, tuple(column for column, _ in terms)), params
+
 def search_companies(query, limit=10):
     """
-    회사명으로 데이터베이스를 검색합니다.
+    회사명, 초성(예: 'ㅅㅅㅈㅈ'), 영문/로마자(예: 'samsung'), 종목코드(예: '005930')로 데이터베이스를 검색합니다.
     
     Args:
-        query: 검색할 회사명
+        query: 검색어
         limit: 최대 결과 수
         
     Returns:
         검색 결과 목록
     """
-    # 데이터베이스 연결
-    conn = sqlite3.connect('corp_codes.db')
-    conn.row_factory = sqlite3.Row  # 결과를 딕셔너리 형태로 반환
-    cursor = conn.cursor()
+    query = query.strip()
+    if not query:
+        return []
     
     try:
-        # 검색 쿼리 실행
-        cursor.execute(
-            'SELECT * FROM companies WHERE corp_name LIKE ? ORDER BY CASE WHEN stock_code IS NOT NULL AND stock_code != "" THEN 0 ELSE 1 END, corp_name LIMIT ?',
-            (f'%{query}%', limit)
-        )
+        # 스레드별 읽기 전용 연결 재사용
+        cursor = get_read_connection().cursor()
+        
+        # 숫자만 입력한 경우 종목코드/고유번호 우선 검색
+        if query.isdigit():
+            cursor.execute(SEARCH_STOCK_CODE_SQL, {'query': query, 'query_end': query + '\U0010ffff', 'limit': limit})
+            results = [dict(row) for row in cursor.fetchall()]
+            if results:
+                return results
+        
+        # 검색 쿼리 실행 (1글자 검색어(초성 제외)는 접두어 일치 다음에 부분 일치 결과를 보여줌)
+        sql, params = build_search_query(query, limit)
+        substring = len(query) == 1 and not is_chosung_query(query)
+        try:
+            cursor.execute(sql, params)
+        except sqlite3.OperationalError:
+            # 검색 인덱스가 없는 경우 전체 검색
+            cursor.execute(SEARCH_LIKE_SQL, {'like': f'%{query}%', 'limit': limit})
+            substring = False
         
         # 결과 가져오기
         results = [dict(row) for row in cursor.fetchall()]
+        
+        if substring and len(results) < limit:
+            # 로마자 접두어로 이미 찾은 회사는 제외
+            found = {row['id'] for row in results}
+            cursor.execute(SEARCH_SUBSTRING_SQL, {'query': query.lower(), 'limit': limit})
+            results += [dict(row) for row in cursor.fetchall() if row['id'] not in found][:limit - len(results)]
         return results
     
     except Exception as e:
         print(f"회사 검색 중 오류 발생: {e}")
         return []
+
+def get_companies_by_codes(corp_codes):
+    """
+    고유번호(corp_code) 목록으로 회사 정보를 조회합니다.
     
-    finally:
-        # 연결 종료
-        conn.close()
+    Args:
+        corp_codes: 고유번호 목록
+        
+    Returns:
+        {고유번호: 회사 정보} 딕셔너리 (없는 고유번호는 제외)
+    """
+    corp_codes = list(corp_codes)
+    if not corp_codes:
+        return {}
+    
+    try:
+        cursor = get_read_connection().cursor()
+        placeholders = ', '.join('?' * len(corp_codes))
+        cursor.execute(
+            f'SELECT corp_code, corp_name, stock_code FROM companies WHERE corp_code IN ({placeholders})',
+            corp_codes
+        )
+        return {row['corp_code']: dict(row) for row in cursor.fetchall()}
+    
+    except Exception as e:
+        print(f"회사 정보 조회 중 오류 발생: {e}")
+        return {}
 
 if __name__ == '__main__':
     # 데이터베이스 생성
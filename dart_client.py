@@ -0,0 +1,170 @@
+import time
+import random
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Open DART API 기본 URL
+DART_BASE_URL = 'https://opendart.fss.or.kr/api'
+
+# 연결/응답 대기 시간 (초)
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+# 재시도 설정 (5xx 응답과 RETRY_EXCEPTIONS만 재시도)
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 4.0
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# 재시도하는 요청 예외 (연결 오류, 타임아웃, 응답 본문을 읽는 중 끊기거나 깨진 경우)
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """DART 장애로 회로가 열려 있어 요청을 보내지 않았을 때 발생합니다."""
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 임계치를 넘으면 일정 시간 동안 요청을 즉시 거부하는 회로 차단기입니다.
+    대기 시간이 지나면 요청 하나만 시험적으로 통과시키고, 성공하면 다시 닫습니다.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            # half-open: 시험 요청 하나만 허용
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        # 성공/실패를 기록하지 못하고 끝난 시험 요청 정리 (다음 요청이 다시 시험할 수 있도록)
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"DART 요청이 {self._failures}회 연속 실패하여 {self.reset_timeout}초 동안 요청을 차단합니다.")
+                self._opened_at = time.monotonic()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+
+class DartClient:
+    """
+    Open DART API용 HTTP 클라이언트입니다.
+    연결을 재사용하는 세션 풀, 연결/응답 타임아웃, 지터가 있는 지수 백오프 재시도, 회로 차단기를 제공합니다.
+    """
+
+    def __init__(self, api_key, pool_size=10, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 max_retries=MAX_RETRIES, breaker=None):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff(self, attempt):
+        # full jitter: 0 ~ min(최대값, 기본값 * 2^attempt) 사이에서 무작위 대기
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def get(self, endpoint, params=None, timeout=None):
+        """
+        DART API에 GET 요청을 보냅니다.
+
+        Args:
+            endpoint: API 경로 (예: 'fnlttSinglAcnt.json')
+            params: crtfc_key를 제외한 요청 파라미터
+            timeout: (연결, 응답) 타임아웃. 생략하면 기본값 사용
+
+        Returns:
+            requests.Response (4xx 응답은 그대로 반환)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있는 경우
+            requests.exceptions.RequestException: 재시도 후에도 실패한 경우
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("DART API 장애로 요청이 일시적으로 차단되었습니다.")
+
+        url = f"{DART_BASE_URL}/{endpoint}"
+        query = dict(params or {})
+        query['crtfc_key'] = self.api_key
+
+        try:
+            return self._get_with_retries(url, query, timeout or self.timeout)
+        finally:
+            # 어떤 경로로 끝나든 half-open 시험 요청 표시가 남지 않도록 함
+            self.breaker.release_trial()
+
+    def _get_with_retries(self, url, query, timeout):
+        # 모든 종료 경로에서 회로 차단기에 성공 또는 실패를 기록
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                wait_time = self._backoff(attempt - 1)
+                logger.info(f"DART 요청 재시도 {attempt}/{self.max_retries} ({wait_time:.2f}초 대기): {last_error}")
+                time.sleep(wait_time)
+
+            try:
+                response = self.session.get(url, params=query, timeout=timeout)
+            except RETRY_EXCEPTIONS as e:
+                last_error = e
+                continue
+            except requests.exceptions.RequestException:
+                # 재시도해도 같은 결과인 요청 오류는 바로 실패로 기록
+                self.breaker.record_failure()
+                raise
+
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = requests.exceptions.HTTPError(
+                    f"DART 서버 오류 (Status Code: {response.status_code})", response=response
+                )
+                continue
+
+            self.breaker.record_success()
+            return response
+
+        self.breaker.record_failure()
+        raise last_error
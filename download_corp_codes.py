@@ -1,110 +1,170 @@
 import os
+import sys
 import json
-import requests
-import xmltodict
-from dotenv import load_dotenv
+import argparse
 import zipfile
+import requests
+import xml.etree.ElementTree as ET
 from io import BytesIO
+from dotenv import load_dotenv
+from dart_client import DartClient, CONNECT_TIMEOUT
+from create_db import bulk_load, sync_companies, DB_PATH
 
-# .env 파일에서 환경변수 로드
-load_dotenv()
+# 회사 정보 필드
+CORP_FIELDS = ('corp_code', 'corp_name', 'stock_code', 'modify_date')
 
-# API 키 가져오기
-API_KEY = os.getenv('OPEN_DART_API_KEY')
+# 전체 회사 코드 ZIP은 크기가 커서 응답 대기 시간을 늘림
+DOWNLOAD_TIMEOUT = (CONNECT_TIMEOUT, 120)
 
-if not API_KEY:
-    print("Error: OPEN_DART_API_KEY가 .env 파일에 설정되지 않았습니다.")
-    exit(1)
 
-print(f"API 키: {API_KEY[:5]}...{API_KEY[-5:]}")
+def download_corp_code_zip(client):
+    """
+    DART에서 전체 회사 코드 ZIP 파일을 내려받습니다. (디스크에 저장하지 않음)
 
-# API URL
-url = f"https://opendart.fss.or.kr/api/corpCode.xml?crtfc_key={API_KEY}"
+    Args:
+        client: DartClient
 
-print("회사 코드 파일 다운로드 중...")
+    Returns:
+        ZIP 파일 내용 (bytes)
+    """
+    response = client.get('corpCode.xml')
 
-try:
-    # API 요청
-    response = requests.get(url)
-    
     # 응답 상태 확인
     if response.status_code != 200:
-        print(f"Error: API 요청 실패 (상태 코드: {response.status_code})")
-        print(f"응답 내용: {response.text}")
-        exit(1)
-
-    # 응답 내용이 XML인지 확인
-    content_type = response.headers.get('Content-Type', '')
-    print(f"응답 Content-Type: {content_type}")
-    
-    # 응답 크기 확인
-    print(f"응답 크기: {len(response.content)} bytes")
-
-    # 응답이 XML이고 오류 메시지가 포함되어 있는지 확인
+        raise RuntimeError(f"API 요청 실패 (상태 코드: {response.status_code}, 응답 내용: {response.text[:200]})")
+
+    # 오류 시에는 ZIP 대신 짧은 XML(<result><status>..)이 반환됨
     if len(response.content) < 1000 and b'<status>' in response.content:
-        try:
-            error_dict = xmltodict.parse(response.content)
-            status = error_dict.get('r', {}).get('status')
-            message = error_dict.get('r', {}).get('message')
-            print(f"API 응답 상태: {status}, 메시지: {message}")
-            if status != '000':
-                print("API 오류가 발생했습니다. 자세한 내용은 위의 메시지를 참조하세요.")
-                exit(1)
-        except Exception as e:
-            print(f"응답 파싱 오류: {e}")
-
-    # ZIP 파일로 저장
-    with open('corpCode.zip', 'wb') as f:
-        f.write(response.content)
-    
-    print("ZIP 파일 다운로드 완료")
-
-    # ZIP 파일 압축 해제 및 XML 파싱
+        root = ET.fromstring(response.content)
+        status = root.findtext('status')
+        message = root.findtext('message')
+        if status != '000':
+            raise RuntimeError(f"API 오류가 발생했습니다. (상태: {status}, 메시지: {message})")
+
+    return response.content
+
+
+def iter_corp_codes(zip_bytes):
+    """
+    메모리의 ZIP에서 CORPCODE.xml을 스트리밍으로 파싱해 회사 정보를 하나씩 반환합니다.
+    처리한 요소는 바로 정리하므로 회사 수와 관계없이 메모리 사용량이 일정합니다.
+
+    Args:
+        zip_bytes: download_corp_code_zip()이 반환한 ZIP 파일 내용
+
+    Returns:
+        {'corp_code', 'corp_name', 'stock_code', 'modify_date'} 딕셔너리 제너레이터
+    """
+    with zipfile.ZipFile(BytesIO(zip_bytes)) as zip_ref:
+        with zip_ref.open('CORPCODE.xml') as xml_file:
+            root = None
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                    continue
+                if event != 'end' or elem.tag != 'list':
+                    continue
+
+                # 값이 없는 항목(비상장사의 종목코드 등)은 None으로 저장
+                yield {field: (elem.findtext(field) or '').strip() or None for field in CORP_FIELDS}
+
+                # 처리한 요소 정리
+                root.clear()
+
+
+def write_corp_codes_json(companies, json_path='corp_codes.json'):
+    """
+    회사 정보를 JSON 배열 파일로 저장합니다. (한 항목씩 기록)
+
+    Returns:
+        저장된 회사 수
+    """
+    count = 0
+    with open(json_path, 'w', encoding='utf-8') as json_file:
+        json_file.write('[\n')
+        for company in companies:
+            if count:
+                json_file.write(',\n')
+            json.dump(company, json_file, ensure_ascii=False)
+            count += 1
+        json_file.write('\n]\n')
+    return count
+
+
+def refresh_corp_codes(client, db_path=DB_PATH):
+    """
+    전체 회사 코드를 내려받아 중간 파일 없이 데이터베이스에 바로 적재합니다.
+
+    Returns:
+        저장된 회사 수
+    """
+    zip_bytes = download_corp_code_zip(client)
+    return bulk_load(iter_corp_codes(zip_bytes), db_path)
+
+
+def sync_corp_codes(client, db_path=DB_PATH):
+    """
+    전체 회사 코드를 내려받아 마지막 동기화 이후 변경된 회사만 데이터베이스에 반영합니다.
+    데이터베이스가 없으면 전체 적재를 수행합니다.
+
+    Returns:
+        (변경된 회사 수, 새 기준일)
+    """
+    zip_bytes = download_corp_code_zip(client)
+    if not os.path.exists(db_path):
+        count = bulk_load(iter_corp_codes(zip_bytes), db_path)
+        return count, None
+    return sync_companies(iter_corp_codes(zip_bytes), db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DART 회사 코드를 내려받아 corp_codes.db를 갱신합니다.')
+    parser.add_argument('--json', action='store_true', help='데이터베이스 대신 corp_codes.json 파일로 저장')
+    parser.add_argument('--incremental', action='store_true', help='마지막 동기화 이후 변경된 회사만 반영 (앱 실행 중에도 사용 가능)')
+    args = parser.parse_args()
+
+    # .env 파일에서 환경변수 로드
+    load_dotenv()
+
+    # API 키 가져오기
+    api_key = os.getenv('OPEN_DART_API_KEY')
+
+    if not api_key:
+        print("Error: OPEN_DART_API_KEY가 .env 파일에 설정되지 않았습니다.")
+        sys.exit(1)
+
+    print(f"API 키: {api_key[:5]}...{api_key[-5:]}")
+
+    # DART API 클라이언트
+    client = DartClient(api_key, pool_size=1, timeout=DOWNLOAD_TIMEOUT)
+
+    print("회사 코드 파일 다운로드 중...")
+
     try:
-        with zipfile.ZipFile('corpCode.zip', 'r') as zip_ref:
-            # ZIP 파일 내용 확인
-            print("ZIP 파일 내용:")
-            for file_info in zip_ref.filelist:
-                print(f" - {file_info.filename} ({file_info.file_size} bytes)")
-            
-            # CORPCODE.xml 파일 읽기
-            with zip_ref.open('CORPCODE.xml') as xml_file:
-                xml_content = xml_file.read()
-                
-                # XML을 딕셔너리로 변환
-                xml_dict = xmltodict.parse(xml_content)
-                
-                # 회사 정보만 추출
-                corps = xml_dict.get('result', {}).get('list', [])
-                
-                # 필요한 정보만 정리
-                corp_list = []
-                for corp in corps:
-                    corp_info = {
-                        'corp_code': corp.get('corp_code', ''),
-                        'corp_name': corp.get('corp_name', ''),
-                        'stock_code': corp.get('stock_code', ''),
-                        'modify_date': corp.get('modify_date', '')
-                    }
-                    corp_list.append(corp_info)
-                
-                # JSON 파일로 저장
-                with open('corp_codes.json', 'w', encoding='utf-8') as json_file:
-                    json.dump(corp_list, json_file, ensure_ascii=False, indent=2)
-        
-        print("JSON 파일 생성 완료 - corp_codes.json 파일을 확인해주세요.")
+        if args.json:
+            zip_bytes = download_corp_code_zip(client)
+            print(f"ZIP 파일 다운로드 완료 ({len(zip_bytes)} bytes)")
+            count = write_corp_codes_json(iter_corp_codes(zip_bytes))
+            print(f"JSON 파일 생성 완료 - corp_codes.json에 {count}개 회사 정보가 저장되었습니다.")
+        elif args.incremental:
+            count, watermark = sync_corp_codes(client)
+            if watermark is None:
+                print(f"데이터베이스 생성 완료 - {DB_PATH}에 {count}개 회사 정보가 저장되었습니다.")
+            else:
+                print(f"증분 동기화 완료 - {count}개 회사 정보가 갱신되었습니다. (기준일: {watermark})")
+        else:
+            count = refresh_corp_codes(client)
+            print(f"데이터베이스 갱신 완료 - {DB_PATH}에 {count}개 회사 정보가 저장되었습니다.")
     except zipfile.BadZipFile:
         print("Error: 잘못된 ZIP 파일입니다.")
-        # 응답 내용 확인
-        print("\n응답 내용 처음 100바이트:")
-        print(response.content[:100])
-    
-    # ZIP 파일 삭제
-    if os.path.exists('corpCode.zip'):
-        os.remove('corpCode.zip')
-        print("임시 ZIP 파일 삭제 완료")
-
-except requests.exceptions.RequestException as e:
-    print(f"Error: API 요청 중 오류 발생: {e}")
-except Exception as e:
-    print(f"Error: 예상치 못한 오류 발생: {e}") 
\ No newline at end of file
+        sys.exit(1)
+    except requests.exceptions.RequestException as e:
+        print(f"Error: API 요청 중 오류 발생: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: 예상치 못한 오류 발생: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,8 @@
 import os
-import json
-import google.generativeai as genai
-import pandas as pd
+import threading
+from financial_data import PERIODS
+from financial_metrics import get_metrics, NOT_AVAILABLE
 from dotenv import load_dotenv
-import time
 import logging
 
 # 로깅 설정
@@ -18,133 +17,63 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     raise Exception("Gemini API 키가 .env에 없습니다. 환경변수를 확인하세요.")
 
-genai.configure(api_key=GEMINI_API_KEY)
+# Gemini 모델은 첫 분석 요청 때 만듦 (google.generativeai 임포트가 무거워 검색만 하는 워커의 시작을 늦추지 않도록)
+_model = None
+_model_lock = threading.Lock()
 
-# 모델 설정 (더 가벼운 모델 사용)
-try:
-    model = genai.GenerativeModel('gemini-1.5-flash')  # 더 빠르고 할당량이 적은 모델
-except:
-    model = genai.GenerativeModel('gemini-1.5-pro')  # fallback
+def get_model():
+    """
+    Gemini API를 설정하고 분석에 사용할 모델을 반환합니다. (프로세스마다 한 번만 생성)
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            
+            # 모델 설정 (더 가벼운 모델 사용)
+            try:
+                _model = genai.GenerativeModel('gemini-1.5-flash')  # 더 빠르고 할당량이 적은 모델
+            except:
+                _model = genai.GenerativeModel('gemini-1.5-pro')  # fallback
+        return _model
 
-def extract_financial_highlights(financial_data):
+def extract_financial_highlights(statement):
     """
     재무제표 데이터에서 주요 정보를 추출합니다.
     
     Args:
-        financial_data: DART API로부터 받은 재무제표 데이터
+        statement: normalize_financial_data()로 정규화한 FinancialStatement
         
     Returns:
         분석에 필요한 주요 재무 정보
     """
-    if not financial_data or 'list' not in financial_data:
+    if statement is None:
         return None
     
-    # 데이터프레임 생성
-    df = pd.DataFrame(financial_data['list'])
-    
-    # 연결 재무제표만 필터링
-    cfs_df = df[df['fs_div'] == 'CFS']
-    if cfs_df.empty:
-        cfs_df = df[df['fs_div'] == 'OFS']
-    
     # 필요한 계정과목 선택
-    accounts = ['자산총계', '부채총계', '자본총계', '매출액', '영업이익', '당기순이익']
-    filtered_data = cfs_df[cfs_df['account_nm'].isin(accounts)].copy()
+    bs_accounts = ['자산총계', '부채총계', '자본총계']
+    is_accounts = ['매출액', '영업이익', '당기순이익']
+    
+    # 재무상태표 / 손익계산서 데이터 추출 (당기, 전기, 전전기)
+    bs_data = statement.select(bs_accounts, PERIODS)
+    is_data = statement.select(is_accounts, PERIODS)
     
-    if filtered_data.empty:
+    if bs_data.empty and is_data.empty:
         return None
     
+    # 재무비율/성장률은 차트와 공유하는 계산 결과 사용
+    metrics = get_metrics(statement)
+    
     # 결과 저장할 딕셔너리
     highlights = {
-        '회사정보': {
-            '회사명': cfs_df['corp_name'].iloc[0] if 'corp_name' in cfs_df.columns else '정보 없음',
-            '종목코드': cfs_df['stock_code'].iloc[0] if 'stock_code' in cfs_df.columns else '정보 없음',
-            '보고서': cfs_df['reprt_code'].iloc[0] if 'reprt_code' in cfs_df.columns else '정보 없음',
-            '연도': cfs_df['bsns_year'].iloc[0] if 'bsns_year' in cfs_df.columns else '정보 없음',
-        },
-        '재무상태표': {},
-        '손익계산서': {},
-        '재무비율': {}
+        '회사정보': dict(statement.info),
+        '재무상태표': bs_data.to_dict('index'),
+        '손익계산서': is_data.to_dict('index'),
+        '재무비율': metrics['재무비율'],
+        '성장률': metrics['성장률']
     }
     
-    # 재무상태표 데이터 추출
-    bs_accounts = ['자산총계', '부채총계', '자본총계']
-    bs_data = filtered_data[filtered_data['account_nm'].isin(bs_accounts)]
-    
-    # 손익계산서 데이터 추출
-    is_accounts = ['매출액', '영업이익', '당기순이익']
-    is_data = filtered_data[filtered_data['account_nm'].isin(is_accounts)]
-    
-    # 문자열 금액을 숫자로 변환하는 함수
-    def parse_amount(amount_str):
-        if pd.isna(amount_str) or amount_str == '':
-            return 0
-        return int(amount_str.replace(',', ''))
-    
-    # 재무상태표 데이터 저장
-    for _, row in bs_data.iterrows():
-        account = row['account_nm']
-        highlights['재무상태표'][account] = {
-            '당기': parse_amount(row['thstrm_amount']) if 'thstrm_amount' in row else 0,
-            '전기': parse_amount(row['frmtrm_amount']) if 'frmtrm_amount' in row else 0,
-            '전전기': parse_amount(row['bfefrmtrm_amount']) if 'bfefrmtrm_amount' in row else 0
-        }
-    
-    # 손익계산서 데이터 저장
-    for _, row in is_data.iterrows():
-        account = row['account_nm']
-        highlights['손익계산서'][account] = {
-            '당기': parse_amount(row['thstrm_amount']) if 'thstrm_amount' in row else 0,
-            '전기': parse_amount(row['frmtrm_amount']) if 'frmtrm_amount' in row else 0,
-            '전전기': parse_amount(row['bfefrmtrm_amount']) if 'bfefrmtrm_amount' in row else 0
-        }
-    
-    # 재무비율 계산
-    try:
-        if '자산총계' in highlights['재무상태표'] and '부채총계' in highlights['재무상태표'] and '자본총계' in highlights['재무상태표']:
-            assets = highlights['재무상태표']['자산총계']['당기']
-            liabilities = highlights['재무상태표']['부채총계']['당기']
-            equity = highlights['재무상태표']['자본총계']['당기']
-            
-            if equity > 0:
-                highlights['재무비율']['부채비율'] = round((liabilities / equity) * 100, 2)
-            else:
-                highlights['재무비율']['부채비율'] = None
-                
-            if assets > 0:
-                highlights['재무비율']['부채비율(부채/자산)'] = round((liabilities / assets) * 100, 2)
-            else:
-                highlights['재무비율']['부채비율(부채/자산)'] = None
-        
-        if '당기순이익' in highlights['손익계산서'] and '자본총계' in highlights['재무상태표'] and '자산총계' in highlights['재무상태표']:
-            net_income = highlights['손익계산서']['당기순이익']['당기']
-            equity = highlights['재무상태표']['자본총계']['당기']
-            assets = highlights['재무상태표']['자산총계']['당기']
-            
-            if equity > 0:
-                highlights['재무비율']['ROE(자기자본이익률)'] = round((net_income / equity) * 100, 2)
-            else:
-                highlights['재무비율']['ROE(자기자본이익률)'] = None
-                
-            if assets > 0:
-                highlights['재무비율']['ROA(총자산이익률)'] = round((net_income / assets) * 100, 2)
-            else:
-                highlights['재무비율']['ROA(총자산이익률)'] = None
-        
-        if '영업이익' in highlights['손익계산서'] and '매출액' in highlights['손익계산서']:
-            operating_profit = highlights['손익계산서']['영업이익']['당기']
-            net_income = highlights['손익계산서']['당기순이익']['당기']
-            sales = highlights['손익계산서']['매출액']['당기']
-            
-            if sales > 0:
-                highlights['재무비율']['영업이익률'] = round((operating_profit / sales) * 100, 2)
-                highlights['재무비율']['순이익률'] = round((net_income / sales) * 100, 2)
-            else:
-                highlights['재무비율']['영업이익률'] = None
-                highlights['재무비율']['순이익률'] = None
-    except Exception as e:
-        logger.error(f"재무비율 계산 중 오류 발생: {e}")
-    
     return highlights
 
 def format_currency(amount, unit='원'):
@@ -186,7 +115,7 @@ def prepare_financial_summary(highlights):
         current = format_currency(values['당기'])
         previous = format_currency(values['전기'])
         change = values['당기'] - values['전기'] if values['당기'] is not None and values['전기'] is not None else None
-        change_percent = (change / values['전기'] * 100) if change is not None and values['전기'] != 0 else None
+        change_percent = highlights['성장률'].get(account, {}).get('당기')
         
         change_str = f"(전년대비 {format_currency(change)}, {change_percent:.2f}%)" if change is not None and change_percent is not None else ""
         summary.append(f"{account}: {current} {change_str}")
@@ -199,7 +128,7 @@ def prepare_financial_summary(highlights):
         current = format_currency(values['당기'])
         previous = format_currency(values['전기'])
         change = values['당기'] - values['전기'] if values['당기'] is not None and values['전기'] is not None else None
-        change_percent = (change / values['전기'] * 100) if change is not None and values['전기'] != 0 else None
+        change_percent = highlights['성장률'].get(account, {}).get('당기')
         
         change_str = f"(전년대비 {format_currency(change)}, {change_percent:.2f}%)" if change is not None and change_percent is not None else ""
         summary.append(f"{account}: {current} {change_str}")
@@ -212,7 +141,15 @@ def prepare_financial_summary(highlights):
         if value is not None:
             summary.append(f"{ratio}: {value:.2f}%")
         else:
-            summary.append(f"{ratio}: 정보 없음")
+            summary.append(f"{ratio}: {NOT_AVAILABLE} (분모가 0 이하라 계산하지 않음)")
+    summary.append("")
+    
+    # 성장률 (당기: 전기 대비, 전기: 전전기 대비)
+    summary.append("전년 대비 증감률 (당기 / 전기)")
+    summary.append("-" * 50)
+    for account, rates in highlights['성장률'].items():
+        rates_str = " / ".join(f"{rate:+.2f}%" if rate is not None else "정보 없음" for rate in rates.values())
+        summary.append(f"{account}: {rates_str}")
     
     return "\n".join(summary)
 
@@ -238,7 +175,7 @@ def generate_fallback_analysis(highlights):
         assets = highlights['재무상태표']['자산총계']['당기']
         prev_assets = highlights['재무상태표']['자산총계']['전기']
         assets_change = assets - prev_assets if prev_assets != 0 else 0
-        assets_change_pct = (assets_change / prev_assets * 100) if prev_assets != 0 else 0
+        assets_change_pct = highlights['성장률']['자산총계']['당기'] or 0
         
         analysis.append(f"• 총자산: {format_currency(assets)}")
         if prev_assets != 0:
@@ -270,7 +207,7 @@ def generate_fallback_analysis(highlights):
         sales = highlights['손익계산서']['매출액']['당기']
         prev_sales = highlights['손익계산서']['매출액']['전기']
         sales_change = sales - prev_sales if prev_sales != 0 else 0
-        sales_change_pct = (sales_change / prev_sales * 100) if prev_sales != 0 else 0
+        sales_change_pct = highlights['성장률']['매출액']['당기'] or 0
         
         analysis.append(f"• 매출액: {format_currency(sales)}")
         if prev_sales != 0:
@@ -297,7 +234,7 @@ def generate_fallback_analysis(highlights):
         analysis.append(f"• 당기순이익: {format_currency(net_income)}")
         if prev_net_income != 0:
             net_change = net_income - prev_net_income
-            net_change_pct = (net_change / prev_net_income * 100)
+            net_change_pct = highlights['성장률']['당기순이익']['당기']
             change_symbol = "📈" if net_change > 0 else "📉" if net_change < 0 else "➡️"
             analysis.append(f"  {change_symbol} 전년대비 {format_currency(net_change)} ({net_change_pct:+.1f}%)")
     
@@ -310,14 +247,16 @@ def generate_fallback_analysis(highlights):
     for ratio, value in highlights['재무비율'].items():
         if value is not None:
             analysis.append(f"• {ratio}: {value:.1f}%")
+        else:
+            analysis.append(f"• {ratio}: {NOT_AVAILABLE}")
     
     analysis.append("")
     analysis.append("💡 종합 평가")
     analysis.append("-" * 30)
     
-    # 간단한 종합 평가
-    if 'ROE(자기자본이익률)' in highlights['재무비율']:
-        roe = highlights['재무비율']['ROE(자기자본이익률)']
+    # 간단한 종합 평가 (계산하지 않은 비율(None)은 평가하지 않음)
+    roe = highlights['재무비율'].get('ROE(자기자본이익률)')
+    if roe is not None:
         if roe > 15:
             analysis.append("✅ 높은 ROE로 주주가치 창출이 우수합니다.")
         elif roe > 8:
@@ -325,8 +264,8 @@ def generate_fallback_analysis(highlights):
         else:
             analysis.append("⚠️ ROE가 낮아 수익성 개선이 필요합니다.")
     
-    if '부채비율' in highlights['재무비율']:
-        debt_ratio = highlights['재무비율']['부채비율']
+    debt_ratio = highlights['재무비율'].get('부채비율')
+    if debt_ratio is not None:
         if debt_ratio < 100:
             analysis.append("✅ 안정적인 부채비율을 유지하고 있습니다.")
         elif debt_ratio < 200:
@@ -340,27 +279,19 @@ def generate_fallback_analysis(highlights):
     
     return "\n".join(analysis)
 
-def analyze_financial_data(financial_data):
+# AI 분석 재시도 설정 (할당량 초과 시 지수 백오프, 백그라운드 작업에서 사용)
+MAX_RETRIES = 3
+RETRY_DELAY = 5  # 초기 대기 시간 (초)
+
+def build_analysis_prompt(highlights):
     """
-    Gemini API를 사용하여 재무 데이터를 분석합니다.
-    
-    Args:
-        financial_data: DART API로부터 받은 재무제표 데이터
-        
-    Returns:
-        AI 분석 결과
+    주요 재무 정보로 Gemini 분석 프롬프트를 만듭니다.
     """
-    # 재무 정보 추출
-    highlights = extract_financial_highlights(financial_data)
-    
-    if not highlights:
-        return "재무 데이터를 분석할 수 없습니다."
-    
     # 분석을 위한 요약 정보 준비
     financial_summary = prepare_financial_summary(highlights)
     
     # Gemini API 프롬프트 생성 (더 간결하게)
-    prompt = f"""
+    return f"""
     다음은 한국 기업의 재무제표 정보입니다. 간결하고 이해하기 쉽게 분석해주세요.
 
     {financial_summary}
@@ -373,36 +304,32 @@ def analyze_financial_data(financial_data):
 
     전문 용어를 최소화하고 일반인이 이해하기 쉽게 작성해주세요.
     """
+
+def is_quota_error(error):
+    """
+    Gemini API 할당량 초과 오류인지 확인합니다. (재시도 대상)
+    """
+    error_msg = str(error).lower()
+    return "quota" in error_msg or "429" in error_msg
+
+def generate_analysis(prompt):
+    """
+    Gemini API를 한 번 호출하여 분석 결과를 반환합니다. (재시도는 호출하는 쪽에서 처리)
     
-    max_retries = 3
-    retry_delay = 5  # 초기 대기 시간
+    Raises:
+        Exception: Gemini API 호출이 실패한 경우
+    """
+    response = get_model().generate_content(prompt)
+    return response.text
+
+def stream_analysis(prompt):
+    """
+    Gemini API 스트리밍 모드로 분석 결과를 생성되는 대로 조각(문자열)씩 반환합니다.
     
-    for attempt in range(max_retries):
-        try:
-            # Gemini API 호출
-            response = model.generate_content(prompt)
-            analysis = response.text
-            
-            return analysis
-            
-        except Exception as e:
-            error_msg = str(e)
-            logger.warning(f"AI 분석 시도 {attempt + 1}/{max_retries} 실패: {error_msg}")
-            
-            # 할당량 초과 오류인지 확인
-            if "quota" in error_msg.lower() or "429" in error_msg:
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)  # 지수 백오프
-                    logger.info(f"할당량 초과. {wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error("Gemini API 할당량 초과. 기본 분석을 제공합니다.")
-                    return generate_fallback_analysis(highlights)
-            else:
-                # 다른 오류의 경우 기본 분석 제공
-                logger.error(f"AI 분석 중 오류 발생: {e}")
-                return generate_fallback_analysis(highlights)
-    
-    # 모든 재시도 실패 시 기본 분석 제공
-    return generate_fallback_analysis(highlights) 
\ No newline at end of file
+    Raises:
+        Exception: Gemini API 호출이 실패한 경우
+    """
+    response = get_model().generate_content(prompt, stream=True)
+    for chunk in response:
+        if chunk.text:
+            yield chunk.text
@@ -0,0 +1,124 @@
+# DART 금액 컬럼 -> 기간 이름
+PERIOD_COLUMNS = {
+    'thstrm_amount': '당기',
+    'frmtrm_amount': '전기',
+    'bfefrmtrm_amount': '전전기',
+}
+PERIODS = list(PERIOD_COLUMNS.values())
+
+# 재무제표 구분 우선순위 (연결 -> 별도)
+FS_DIV_PRIORITY = ('CFS', 'OFS')
+
+# 보고서 기본 정보 필드
+INFO_FIELDS = {
+    'corp_name': '회사명',
+    'stock_code': '종목코드',
+    'reprt_code': '보고서',
+    'bsns_year': '연도',
+}
+
+# 차트와 기업 비교에 사용되는 계정과목
+BS_ACCOUNTS = ['자산총계', '부채총계', '자본총계']
+BALANCE_ACCOUNTS = ['자산총계', '부채총계', '자본총계', '유동자산', '비유동자산', '유동부채', '비유동부채']
+IS_ACCOUNTS = ['매출액', '영업이익', '당기순이익']
+
+
+def parse_amount_column(series):
+    """
+    '1,234,567' 형태의 금액 문자열 컬럼을 한 번에 int64로 변환합니다.
+    빈 값이나 숫자가 아닌 값('-' 등)은 0으로 처리합니다.
+    """
+    import pandas as pd
+
+    cleaned = series.astype('string').str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0).astype('int64')
+
+
+class FinancialStatement:
+    """
+    DART 재무제표 응답(list)을 한 번만 정규화한 결과입니다.
+    연결(CFS)/별도(OFS) 선택을 끝낸 계정과목별 금액표를 차트와 AI 분석이 함께 사용합니다.
+
+    Attributes:
+        amounts: 계정과목(account_nm) 인덱스, 당기/전기/전전기 int64 컬럼의 DataFrame (응답 순서 유지)
+        fs_div: 선택된 재무제표 구분 ('CFS' 또는 'OFS')
+        info: 회사명/종목코드/보고서/연도 딕셔너리
+        periods: 응답에 금액 컬럼이 있었던 기간 (전전기는 사업보고서에만 있음)
+    """
+
+    def __init__(self, amounts, fs_div=None, info=None, periods=None):
+        self.amounts = amounts
+        self.fs_div = fs_div
+        self.info = info or {}
+        self.periods = periods if periods is not None else list(PERIODS)
+
+    def __contains__(self, account):
+        return account in self.amounts.index
+
+    @property
+    def empty(self):
+        return self.amounts.empty
+
+    def get(self, account, period='당기', default=0):
+        """
+        계정과목의 기간별 금액을 반환합니다. 계정이 없으면 default를 반환합니다.
+        """
+        if account not in self.amounts.index:
+            return default
+        return int(self.amounts.at[account, period])
+
+    def select(self, accounts, periods=None):
+        """
+        주어진 계정과목만 응답 순서대로 골라 반환합니다. (없는 계정은 제외)
+        """
+        rows = self.amounts[self.amounts.index.isin(accounts)]
+        return rows if periods is None else rows[list(periods)]
+
+
+def normalize_financial_data(financial_data):
+    """
+    DART 재무제표 응답을 FinancialStatement로 정규화합니다.
+
+    Args:
+        financial_data: DART API로부터 받은 재무제표 데이터 ({'list': [...]})
+
+    Returns:
+        FinancialStatement. 데이터가 없으면 None
+    """
+    if not financial_data or not financial_data.get('list'):
+        return None
+
+    # pandas는 첫 정규화 때 임포트 (검색만 하는 워커는 불러오지 않음)
+    import pandas as pd
+    df = pd.DataFrame(financial_data['list'])
+
+    # 연결 재무제표 우선, 없으면 별도 재무제표 (응답에 fs_div가 없으면 전체 사용)
+    fs_div = None
+    if 'fs_div' in df.columns:
+        for candidate in FS_DIV_PRIORITY:
+            selected = df[df['fs_div'] == candidate]
+            if not selected.empty:
+                df, fs_div = selected, candidate
+                break
+
+    if df.empty or 'account_nm' not in df.columns:
+        return None
+
+    first = df.iloc[0]
+    info = {label: first.get(field) or '정보 없음' for field, label in INFO_FIELDS.items()}
+
+    # 같은 계정과목이 여러 번 나오면 마지막 값을 사용
+    df = df[~df['account_nm'].duplicated(keep='last')]
+
+    amounts = pd.DataFrame(
+        {
+            period: parse_amount_column(df[column]) if column in df.columns else 0
+            for column, period in PERIOD_COLUMNS.items()
+        },
+        index=df.index,
+        columns=PERIODS,
+    ).astype('int64')
+    amounts.index = pd.Index(df['account_nm'], name='account_nm')
+
+    periods = [period for column, period in PERIOD_COLUMNS.items() if column in df.columns]
+    return FinancialStatement(amounts, fs_div, info, periods)
@@ -0,0 +1,109 @@
+import threading
+import weakref
+from financial_data import PERIODS
+
+# 성장률을 계산하는 계정과목
+GROWTH_ACCOUNTS = ['매출액', '영업이익', '당기순이익', '자산총계', '부채총계', '자본총계']
+
+# 분모가 0 이하라 계산하지 않은 비율(None)의 표시 (차트와 분석 공용)
+NOT_AVAILABLE = 'N/A'
+
+# 레이더 차트 축 이름 -> 재무비율 이름 (PNG 차트와 브라우저 차트 공용)
+RADAR_RATIOS = [
+    ('부채비율', '부채비율'),
+    ('ROA', 'ROA(총자산이익률)'),
+    ('ROE', 'ROE(자기자본이익률)'),
+    ('영업이익률', '영업이익률'),
+    ('순이익률', '순이익률'),
+]
+
+# 보고서별 계산 결과 (FinancialStatement가 캐시에서 사라지면 함께 정리됨)
+_metrics_cache = weakref.WeakKeyDictionary()
+_metrics_lock = threading.Lock()
+
+
+def percent(numerator, denominator):
+    """
+    백분율을 소수점 둘째 자리까지 계산합니다. 분모가 0 이하이면 None을 반환합니다.
+    자본잠식(자본총계 0 이하) 기업의 부채비율/ROE처럼 0 이하 분모로 나눈 비율은 부호가 뒤집혀
+    의미가 없으므로 계산하지 않고, 차트와 분석에서는 NOT_AVAILABLE로 표시합니다.
+    """
+    if denominator is None or denominator <= 0:
+        return None
+    return round(numerator / denominator * 100, 2)
+
+
+def growth_rate(current, previous):
+    """
+    직전 기간 대비 증감률(%)을 계산합니다. 직전 기간 금액이 0이면 None을 반환합니다.
+    """
+    if not previous:
+        return None
+    return round((current - previous) / previous * 100, 2)
+
+
+def compute_metrics(statement):
+    """
+    정규화된 재무제표로 주요 재무비율과 성장률을 계산합니다.
+    계산에 필요한 계정이 없는 비율은 결과에서 빠지고, 분모가 0 이하이면 None이 됩니다. (percent() 참고)
+
+    Args:
+        statement: FinancialStatement
+
+    Returns:
+        {'재무비율': {이름: %}, '성장률': {계정과목: {'당기': 전기 대비 %, '전기': 전전기 대비 %}}}
+    """
+    current = {account: statement.get(account) for account in statement.amounts.index}
+    ratios = {}
+
+    def has(*accounts):
+        return all(account in current for account in accounts)
+
+    if has('자산총계', '부채총계', '자본총계'):
+        ratios['부채비율'] = percent(current['부채총계'], current['자본총계'])
+        ratios['부채비율(부채/자산)'] = percent(current['부채총계'], current['자산총계'])
+        ratios['자기자본비율'] = percent(current['자본총계'], current['자산총계'])
+
+    if has('당기순이익', '자본총계', '자산총계'):
+        ratios['ROE(자기자본이익률)'] = percent(current['당기순이익'], current['자본총계'])
+        ratios['ROA(총자산이익률)'] = percent(current['당기순이익'], current['자산총계'])
+
+    if has('영업이익', '매출액'):
+        ratios['영업이익률'] = percent(current['영업이익'], current['매출액'])
+
+    if has('당기순이익', '매출액'):
+        ratios['순이익률'] = percent(current['당기순이익'], current['매출액'])
+
+    if has('유동자산', '유동부채'):
+        ratios['유동비율'] = percent(current['유동자산'], current['유동부채'])
+
+    # 당기/전기/전전기 금액으로 기간별 전년 대비 증감률 계산
+    growth = {}
+    for account, amounts in statement.select(GROWTH_ACCOUNTS, PERIODS).iterrows():
+        growth[account] = {
+            later: growth_rate(int(amounts[later]), int(amounts[earlier]))
+            for later, earlier in zip(PERIODS, PERIODS[1:])
+        }
+
+    return {'재무비율': ratios, '성장률': growth}
+
+
+def get_metrics(statement):
+    """
+    보고서별로 한 번만 계산한 재무비율/성장률을 반환합니다. (차트와 AI 분석이 공유)
+
+    Returns:
+        compute_metrics()의 결과. statement가 None이면 None
+    """
+    if statement is None:
+        return None
+
+    with _metrics_lock:
+        metrics = _metrics_cache.get(statement)
+    if metrics is not None:
+        return metrics
+
+    metrics = compute_metrics(statement)
+    with _metrics_lock:
+        _metrics_cache[statement] = metrics
+    return metrics
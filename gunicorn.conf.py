@@ -0,0 +1,22 @@
+import os
+
+# gunicorn 설정 (Dockerfile, Procfile에서 공통으로 사용)
+# DART/Gemini 응답을 기다리는 동안 다른 요청을 처리할 수 있도록 스레드 워커(gthread)를 사용합니다.
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# 워커 프로세스 수 (프로세스마다 캐시와 폰트를 따로 로드하므로 적게 유지)
+# 워커마다 차트 렌더링 프로세스를 CHART_PROCESSES개(기본 CPU 수, 최대 2)씩 따로 띄우고 하나에 약 120MB를 쓰므로
+# 전체 메모리는 대략 WEB_CONCURRENCY × (웹 워커 + CHART_PROCESSES × 120MB)입니다.
+# 메모리가 작은 인스턴스(예: 512MB)에서는 WEB_CONCURRENCY=1, CHART_PROCESSES=1 이하로 유지하세요.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+# 워커당 동시 처리 요청 수 (외부 API 대기 시간 동안 다른 요청을 처리)
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+timeout = 300
+keepalive = 5
+max_requests = 1000
+max_requests_jitter = 100
+loglevel = 'info'
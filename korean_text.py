@@ -0,0 +1,73 @@
+import re
+
+# 한글 음절 범위 (가 ~ 힣)
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+
+# 초성 (호환용 자모)
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+
+# 국어의 로마자 표기법 (음운 변화는 반영하지 않음)
+ROMAN_INITIALS = ['g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's', 'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h']
+ROMAN_MEDIALS = ['a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae', 'oe', 'yo', 'u', 'wo', 'we', 'wi', 'yu', 'eu', 'ui', 'i']
+ROMAN_FINALS = ['', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l', 'p', 'l', 'm', 'p', 'p', 't', 't', 'ng', 't', 't', 'k', 't', 'p', 't']
+
+# 영문 브랜드 표기와 로마자 표기의 차이를 줄이기 위한 정규화 규칙
+# (예: samseong/samsung -> samsunk, hyeondae/hyundai -> hyuntai, gia/kia -> kia)
+LOOSE_ROMAN_RULES = [('eo', 'u'), ('eu', 'u'), ('ae', 'ai'), ('g', 'k'), ('d', 't'), ('b', 'p'), ('r', 'l')]
+
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 음절별 변환 결과를 미리 계산한 str.translate 테이블 (대량 변환 시 음절 단위 계산을 피함)
+CHOSUNG_TABLE = {
+    code: CHOSUNG[(code - HANGUL_BASE) // 588]
+    for code in range(HANGUL_BASE, HANGUL_END + 1)
+}
+ROMAN_TABLE = {
+    code: ROMAN_INITIALS[(code - HANGUL_BASE) // 588]
+    + ROMAN_MEDIALS[((code - HANGUL_BASE) % 588) // 28]
+    + ROMAN_FINALS[(code - HANGUL_BASE) % 28]
+    for code in range(HANGUL_BASE, HANGUL_END + 1)
+}
+
+
+def to_chosung(text):
+    """
+    문자열의 한글 음절을 초성으로 바꿉니다. (예: '삼성전자' -> 'ㅅㅅㅈㅈ', 'LG전자' -> 'lgㅈㅈ')
+    공백은 제거하고 영문은 소문자로 통일합니다.
+    """
+    return WHITESPACE_PATTERN.sub('', text).lower().translate(CHOSUNG_TABLE)
+
+
+def is_chosung_query(text):
+    """
+    검색어가 초성으로만 이루어져 있는지 확인합니다. (예: 'ㅅㅅㅈㅈ')
+    """
+    text = ''.join(text.split())
+    return bool(text) and all(ch in CHOSUNG for ch in text)
+
+
+def is_latin_query(text):
+    """
+    검색어가 영문으로 입력되었는지 확인합니다. (예: 'samsung', 'LG')
+    """
+    return text.isascii() and any(ch.isalpha() for ch in text)
+
+
+def romanize(text):
+    """
+    한글 음절을 로마자로 바꿉니다. (예: '삼성전자' -> 'samseongjeonja')
+    """
+    return text.translate(ROMAN_TABLE)
+
+
+def roman_key(text):
+    """
+    회사명과 영문 검색어를 같은 형태로 비교하기 위한 로마자 검색 키를 만듭니다.
+    한글은 로마자로 바꾸고, 영문/숫자 외 문자는 제거한 뒤 표기 차이를 정규화합니다.
+    """
+    key = NON_ALNUM_PATTERN.sub('', romanize(text).lower())
+    for old, new in LOOSE_ROMAN_RULES:
+        key = key.replace(old, new)
+    return key
@@ -0,0 +1,69 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청을 한 번만 실행하고 결과를 함께 나눠 받게 합니다.
+    먼저 들어온 요청이 함수를 실행하는 동안 나머지 요청은 기다렸다가 같은 결과(또는 예외)를 받습니다.
+    실행이 끝나면 키를 지우므로 결과를 보관하지는 않습니다. (보관은 캐시에서 처리)
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {'executed': 0, 'shared': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        key에 대해 진행 중인 실행이 있으면 그 결과를 기다리고, 없으면 fn을 실행합니다.
+
+        Returns:
+            fn의 반환값
+
+        Raises:
+            fn이 발생시킨 예외 (기다린 요청에도 그대로 전달)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.shared += 1
+                self._counters['shared'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._counters['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters['in_flight'] = len(self._calls)
+        return counters
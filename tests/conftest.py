@@ -0,0 +1,9 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(cache.py, dart_client.py 등)을 그대로 임포트
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# API 키가 없으면 임포트 시 예외를 내는 모듈이 있어 테스트용 값을 설정
+os.environ.setdefault('OPEN_DART_API_KEY', 'test-dart-key')
+os.environ.setdefault('GEMINI_API_KEY', 'test-gemini-key')
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from analysis_jobs import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+
+    def sleep(seconds):
+        # 부동소수점 오차로 토큰이 1에 조금 못 미쳐 같은 시각에 계속 기다리지 않도록 약간 더 진행
+        now[0] += seconds + 1e-9
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(time, 'sleep', sleep)
+    return now
+
+
+def max_in_window(timestamps, window=60):
+    return max(
+        sum(1 for other in timestamps[i:] if other - start < window)
+        for i, start in enumerate(timestamps)
+    )
+
+
+@pytest.mark.parametrize('rpm', [1, 2, 4, 15, 60])
+def test_acquire_never_exceeds_rpm_in_any_window(clock, rpm):
+    bucket = TokenBucket(rpm)
+    timestamps = []
+
+    # 연속 요청 -> 쉬어서 버스트를 다시 채움 -> 연속 요청
+    for _ in range(rpm * 3):
+        assert bucket.acquire()
+        timestamps.append(clock[0])
+    clock[0] += 300
+    for _ in range(rpm * 3):
+        assert bucket.acquire()
+        timestamps.append(clock[0])
+
+    assert max_in_window(timestamps) <= rpm
+
+
+def test_initial_burst_is_available_immediately(clock):
+    bucket = TokenBucket(15)
+    start = clock[0]
+
+    for _ in range(3):
+        assert bucket.acquire()
+    assert clock[0] == start
+    assert bucket.available() == 0
+
+
+def test_acquire_times_out(clock):
+    bucket = TokenBucket(1)
+    assert bucket.acquire()
+
+    start = clock[0]
+    assert not bucket.acquire(timeout=5)
+    assert clock[0] - start == pytest.approx(5)
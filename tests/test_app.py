@@ -0,0 +1,53 @@
+import threading
+import uuid
+
+import app
+
+
+def test_cold_fetches_count_one_miss_each(monkeypatch):
+    fetched = []
+
+    def fake_fetch(corp_code, bsns_year, reprt_code):
+        fetched.append(corp_code)
+        return {'status': '000', 'list': []}
+
+    monkeypatch.setattr(app, 'fetch_financial_data', fake_fetch)
+    before = app.financial_cache.stats()
+
+    # 디스크 캐시에 남은 값과 겹치지 않도록 매번 새 회사 코드 사용
+    corp_codes = [uuid.uuid4().hex for _ in range(7)]
+    for corp_code in corp_codes:
+        assert app.get_financial_data(corp_code, '2023', '11011') is not None
+
+    after = app.financial_cache.stats()
+    assert fetched == corp_codes
+    assert after['misses'] - before['misses'] == 7
+    assert after['sets'] - before['sets'] == 7
+
+
+def test_concurrent_cold_fetch_counts_one_miss_per_request(monkeypatch):
+    release = threading.Event()
+
+    def fake_fetch(corp_code, bsns_year, reprt_code):
+        release.wait(5)
+        return {'status': '000', 'list': []}
+
+    monkeypatch.setattr(app, 'fetch_financial_data', fake_fetch)
+    before = app.financial_cache.stats()
+
+    corp_code = uuid.uuid4().hex
+    threads = [
+        threading.Thread(target=app.get_financial_data, args=(corp_code, '2023', '11011'))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    # 요청마다 조회 결과(실패 또는 적중)가 한 번씩만 집계됨
+    after = app.financial_cache.stats()
+    counted = sum(after[k] - before[k] for k in ('misses', 'memory_hits', 'disk_hits'))
+    assert counted == 3
+    assert after['sets'] - before['sets'] == 1
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from cache import LRUCache, SQLiteCache, TieredCache
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return SQLiteCache(str(tmp_path / 'cache.db'), table='test', max_entries=3)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # a를 최근 사용으로 갱신
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_lru_expires_entries(monkeypatch):
+    cache = LRUCache()
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    cache.set('a', 1, ttl=10)
+    assert cache.get('a') == 1
+
+    monkeypatch.setattr(time, 'time', lambda: now + 10)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_sqlite_round_trip_and_expiry(disk, monkeypatch):
+    disk.set('key', {'list': [1, 2], '이름': '삼성전자'}, ttl=10)
+    assert disk.get('key') == {'list': [1, 2], '이름': '삼성전자'}
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+    assert disk.get('key') is None
+
+
+def test_sqlite_keeps_max_entries(disk, monkeypatch):
+    # 같은 시각에 저장되지 않도록 저장할 때마다 시계를 1초씩 진행
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(time, 'time', lambda: next(clock))
+    for i in range(5):
+        disk.set(f'k{i}', i)
+
+    assert [disk.get(f'k{i}') for i in range(5)] == [None, None, 2, 3, 4]
+
+
+def test_tiered_counts_each_lookup_once(disk):
+    cache = TieredCache('test', LRUCache(maxsize=10), disk)
+
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    # 디스크에만 있는 값은 디스크 적중 후 메모리로 올라감
+    cache.memory.clear()
+    assert cache.get('a') == 1
+    assert cache.get('a') == 1
+
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['sets'] == 1
+    assert stats['disk_hits'] == 1
+    assert stats['memory_hits'] == 2
+    assert stats['hit_rate'] == 0.75
+    assert stats['memory_size'] == 1
+
+
+def test_tiered_uncounted_lookup(disk):
+    cache = TieredCache('test', LRUCache(maxsize=10), disk)
+
+    assert cache.get('a', count=False) is None
+    cache.set('a', 1)
+    assert cache.get('a', count=False) == 1
+
+    stats = cache.stats()
+    assert stats['misses'] == 0
+    assert stats['memory_hits'] == 0
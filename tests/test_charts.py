@@ -0,0 +1,47 @@
+import inspect
+
+import pytest
+
+import charts
+
+BILLION = 1_000_000_000
+
+
+def trend_rows(rows, years=('2021', '2022', '2023')):
+    return charts.chart_rows({'columns': list(years), 'rows': rows, 'ratios': {}})
+
+
+def test_trend_chart_skips_accounts_without_any_amount():
+    template = charts.TrendChart()
+    rows = trend_rows([
+        ['자산총계', BILLION, None, 3 * BILLION],
+        ['부채총계', None, None, None],
+        ['매출액', None, None, None],
+    ])
+
+    assert template.render(rows, {}) is not None
+    assert [line.get_label() for line in template.lines] == ['자산총계']
+    assert not template.axes[1].axison  # 그릴 계정이 없는 손익계산서 칸은 숨김
+
+
+def test_trend_chart_is_not_drawn_when_nothing_is_plottable():
+    rows = trend_rows([['자산총계', None, None, None], ['매출액', None, None, None]])
+
+    assert charts.render_chart('trend', rows, {}) is None
+    assert charts.render_chart('trend', trend_rows([]), {}) is None
+
+
+@pytest.mark.parametrize('template_class', [charts.ChartTemplate, charts.BarChartTemplate])
+def test_base_templates_cannot_be_built(template_class):
+    with pytest.raises(TypeError):
+        template_class()
+
+
+def test_registered_templates_are_concrete():
+    for template_class in charts.CHART_TEMPLATES.values():
+        assert not inspect.isabstract(template_class)
+
+
+def test_unknown_chart_kind_is_rejected():
+    with pytest.raises(ValueError):
+        charts.render_chart('base', trend_rows([]), {})
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+import create_db
+from create_db import bulk_load, backup_database, sync_companies, get_sync_meta, WATERMARK_KEY
+
+
+def company(corp_code, corp_name, modify_date='20240101'):
+    return {'corp_code': corp_code, 'corp_name': corp_name, 'stock_code': '', 'modify_date': modify_date}
+
+
+def names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [name for (name,) in conn.execute('SELECT corp_name FROM companies ORDER BY corp_code')]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'corp_codes.db')
+    bulk_load([company('001', '삼성전자'), company('002', 'LG전자')], db_path=path)
+    return path
+
+
+def test_full_rebuild_replaces_contents_in_place(db_path):
+    reader = sqlite3.connect(db_path)
+    try:
+        assert reader.execute('SELECT count(*) FROM companies').fetchone() == (2,)
+
+        assert bulk_load([company('003', '현대자동차')], db_path=db_path) == 1
+
+        # 기존 연결도 다시 열지 않고 새 데이터를 봄
+        assert reader.execute('SELECT corp_name FROM companies').fetchall() == [('현대자동차',)]
+    finally:
+        reader.close()
+
+
+def test_backup_gives_up_while_another_connection_is_writing(db_path, tmp_path):
+    source = sqlite3.connect(str(tmp_path / 'source.db'))
+    source.execute('CREATE TABLE t (x)')
+    source.commit()
+    writer = sqlite3.connect(db_path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+    writer.execute("UPDATE companies SET corp_name = '변경 중' WHERE corp_code = '001'")
+
+    start = time.monotonic()
+    try:
+        with pytest.raises(TimeoutError):
+            backup_database(source, db_path, timeout=0.5)
+    finally:
+        writer.execute('ROLLBACK')
+        writer.close()
+        source.close()
+
+    assert time.monotonic() - start < 5
+    assert names(db_path) == ['삼성전자', 'LG전자']
+
+
+def test_failed_rebuild_keeps_database_and_removes_temp_file(db_path, monkeypatch):
+    def fail(conn, path):
+        raise TimeoutError('locked')
+
+    monkeypatch.setattr(create_db, 'backup_database', fail)
+
+    with pytest.raises(TimeoutError):
+        bulk_load([company('003', '현대자동차')], db_path=db_path)
+
+    assert names(db_path) == ['삼성전자', 'LG전자']
+    assert not os.path.exists(f'{db_path}.tmp')
+
+
+def test_sync_applies_changes_since_watermark(db_path):
+    count, watermark = sync_companies([
+        company('001', '삼성전자', '20240101'),
+        company('002', 'LG전자', '20240101'),
+        company('003', '현대자동차', '20240301'),
+        company('001', '삼성전자(주)', '20240301'),
+    ], db_path=db_path)
+
+    assert (count, watermark) == (2, '20240301')
+    assert names(db_path) == ['삼성전자(주)', 'LG전자', '현대자동차']
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert get_sync_meta(conn, WATERMARK_KEY) == '20240301'
+    finally:
+        conn.close()
@@ -0,0 +1,147 @@
+import time
+
+import pytest
+import requests
+
+import dart_client
+from dart_client import CircuitBreaker, CircuitOpenError, DartClient
+
+
+class FakeResponse:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """미리 정한 응답/예외를 순서대로 돌려주는 세션"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params, timeout))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
+
+
+def make_client(*outcomes, breaker=None):
+    client = DartClient('key', max_retries=2, breaker=breaker or CircuitBreaker(failure_threshold=2, reset_timeout=30))
+    client.session = FakeSession(*outcomes)
+    return client
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == 'open'
+
+
+def test_get_adds_api_key_and_timeout():
+    client = make_client(FakeResponse(200))
+
+    response = client.get('company.json', {'corp_code': '00126380'})
+
+    assert response.status_code == 200
+    url, params, timeout = client.session.calls[0]
+    assert url == f'{dart_client.DART_BASE_URL}/company.json'
+    assert params == {'corp_code': '00126380', 'crtfc_key': 'key'}
+    assert timeout == (dart_client.CONNECT_TIMEOUT, dart_client.READ_TIMEOUT)
+
+
+def test_get_retries_server_errors_and_connection_errors():
+    client = make_client(FakeResponse(503), requests.exceptions.ConnectionError('reset'), FakeResponse(200))
+
+    assert client.get('company.json').status_code == 200
+    assert len(client.session.calls) == 3
+    assert client.breaker.state == 'closed'
+
+
+def test_get_does_not_retry_client_errors():
+    client = make_client(FakeResponse(404))
+
+    assert client.get('company.json').status_code == 404
+    assert len(client.session.calls) == 1
+
+
+def test_get_raises_last_error_after_retries():
+    client = make_client(*[requests.exceptions.Timeout('slow')] * 3)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get('company.json')
+    assert len(client.session.calls) == 3
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    client = make_client(*[FakeResponse(500)] * 6)
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get('company.json')
+
+    assert client.breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        client.get('company.json')
+    assert len(client.session.calls) == 6
+
+
+def test_half_open_allows_one_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    assert not breaker.allow()
+
+    clock[0] += 30
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    assert not breaker.allow()  # 시험 요청이 끝나기 전에는 다른 요청 차단
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    clock[0] += 30
+    client = make_client(*[FakeResponse(502)] * 3, breaker=breaker)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get('company.json')
+
+    assert breaker.state == 'open'
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.InvalidURL('bad url'),
+    requests.exceptions.ChunkedEncodingError('broken body'),
+    ValueError('unexpected'),
+])
+def test_trial_is_released_on_every_exit(clock, error):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    clock[0] += 30
+    client = make_client(*[error] * 3, breaker=breaker)
+
+    with pytest.raises(type(error)):
+        client.get('company.json')
+
+    # 시험 요청이 어떻게 끝나든 다음 시험 요청을 보낼 수 있어야 함
+    clock[0] += 30
+    client.session = FakeSession(FakeResponse(200))
+    assert client.get('company.json').status_code == 200
+    assert breaker.state == 'closed'
@@ -0,0 +1,44 @@
+from financial_data import normalize_financial_data
+from finance_analysis import extract_financial_highlights, prepare_financial_summary, generate_fallback_analysis
+
+
+def account(name, current, previous):
+    return {
+        'account_nm': name,
+        'fs_div': 'CFS',
+        'corp_name': '테스트',
+        'thstrm_amount': current,
+        'frmtrm_amount': previous,
+        'bfefrmtrm_amount': previous,
+    }
+
+
+def highlights_with_equity(equity):
+    return extract_financial_highlights(normalize_financial_data({'list': [
+        account('자산총계', '1,000', '900'),
+        account('부채총계', '1,200', '800'),
+        account('자본총계', equity, '100'),
+        account('매출액', '2,000', '1,500'),
+        account('영업이익', '-100', '50'),
+        account('당기순이익', '-300', '20'),
+    ]}))
+
+
+def test_negative_equity_ratios_show_not_available():
+    highlights = highlights_with_equity('-200')
+
+    analysis = generate_fallback_analysis(highlights)
+    summary = prepare_financial_summary(highlights)
+
+    assert '• 부채비율: N/A' in analysis
+    assert '• ROE(자기자본이익률): N/A' in analysis
+    assert 'ROE가' not in analysis  # 계산하지 않은 비율은 평가하지 않음
+    assert '부채비율: N/A' in summary
+
+
+def test_fallback_analysis_rates_available_ratios():
+    analysis = generate_fallback_analysis(highlights_with_equity('500'))
+
+    assert '• 부채비율: 240.0%' in analysis
+    assert '높은 부채비율' in analysis
+    assert 'ROE가 낮아' in analysis
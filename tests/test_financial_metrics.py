@@ -0,0 +1,81 @@
+import pytest
+
+from financial_data import normalize_financial_data
+from financial_metrics import percent, growth_rate, compute_metrics, get_metrics
+
+
+def account(name, current, previous, before):
+    return {
+        'account_nm': name,
+        'fs_div': 'CFS',
+        'thstrm_amount': current,
+        'frmtrm_amount': previous,
+        'bfefrmtrm_amount': before,
+    }
+
+
+def make_statement(equity='300', net_income='30'):
+    return normalize_financial_data({'list': [
+        account('유동자산', '400', '300', '200'),
+        account('자산총계', '1,000', '800', '800'),
+        account('유동부채', '200', '200', '100'),
+        account('부채총계', '700', '500', '500'),
+        account('자본총계', equity, '300', '300'),
+        account('매출액', '2,000', '1,000', '0'),
+        account('영업이익', '200', '100', '50'),
+        account('당기순이익', net_income, '20', '10'),
+    ]})
+
+
+def test_percent():
+    assert percent(1, 3) == 33.33
+    assert percent(-50, 200) == -25.0
+
+
+@pytest.mark.parametrize('denominator', [0, -100, None])
+def test_percent_is_none_for_non_positive_denominator(denominator):
+    assert percent(100, denominator) is None
+
+
+def test_growth_rate():
+    assert growth_rate(150, 100) == 50.0
+    assert growth_rate(-50, 100) == -150.0
+    assert growth_rate(100, 0) is None
+
+
+def test_compute_metrics():
+    metrics = compute_metrics(make_statement())
+    ratios = metrics['재무비율']
+
+    assert ratios['부채비율'] == 233.33
+    assert ratios['부채비율(부채/자산)'] == 70.0
+    assert ratios['자기자본비율'] == 30.0
+    assert ratios['ROE(자기자본이익률)'] == 10.0
+    assert ratios['ROA(총자산이익률)'] == 3.0
+    assert ratios['영업이익률'] == 10.0
+    assert ratios['순이익률'] == 1.5
+    assert ratios['유동비율'] == 200.0
+
+    assert metrics['성장률']['매출액'] == {'당기': 100.0, '전기': None}
+    assert metrics['성장률']['자산총계'] == {'당기': 25.0, '전기': 0.0}
+
+
+def test_negative_equity_ratios_are_none():
+    ratios = compute_metrics(make_statement(equity='-100'))['재무비율']
+
+    assert ratios['부채비율'] is None
+    assert ratios['ROE(자기자본이익률)'] is None
+    assert ratios['자기자본비율'] == -10.0
+
+
+def test_missing_accounts_are_left_out():
+    statement = normalize_financial_data({'list': [account('매출액', '100', '50', '10')]})
+
+    assert compute_metrics(statement)['재무비율'] == {}
+
+
+def test_get_metrics_is_computed_once_per_statement():
+    statement = make_statement()
+
+    assert get_metrics(statement) is get_metrics(statement)
+    assert get_metrics(None) is None
@@ -0,0 +1,27 @@
+from korean_text import to_chosung, is_chosung_query, is_latin_query, romanize, roman_key
+
+
+def test_to_chosung():
+    assert to_chosung('삼성전자') == 'ㅅㅅㅈㅈ'
+    assert to_chosung('LG 전자') == 'lgㅈㅈ'
+
+
+def test_query_shapes():
+    assert is_chosung_query('ㅅㅅ ㅈㅈ')
+    assert not is_chosung_query('삼성')
+    assert not is_chosung_query('')
+    assert is_latin_query('Samsung')
+    assert not is_latin_query('005930')
+    assert not is_latin_query('삼성')
+
+
+def test_romanize():
+    assert romanize('삼성전자') == 'samseongjeonja'
+    assert romanize('LG전자') == 'LGjeonja'
+
+
+def test_roman_key_matches_brand_spellings():
+    assert roman_key('삼성') == roman_key('samsung')
+    assert roman_key('현대') == roman_key('Hyundai')
+    assert roman_key('기아') == roman_key('KIA')
+    assert roman_key('롯데') == roman_key('lotte')
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+import create_db
+from create_db import create_database, search_companies
+
+COMPANIES = [
+    {'corp_code': '00126380', 'corp_name': '삼성전자', 'stock_code': '005930', 'modify_date': '20240101'},
+    {'corp_code': '00258999', 'corp_name': '삼성전자서비스', 'stock_code': '', 'modify_date': '20240101'},
+    {'corp_code': '00126371', 'corp_name': '삼성물산', 'stock_code': '028260', 'modify_date': '20240101'},
+    {'corp_code': '00401731', 'corp_name': 'LG전자', 'stock_code': '066570', 'modify_date': '20240101'},
+    {'corp_code': '00164742', 'corp_name': '현대자동차', 'stock_code': '005380', 'modify_date': '20240101'},
+    {'corp_code': '00999999', 'corp_name': '한국전력공사', 'stock_code': '015760', 'modify_date': '20240101'},
+    {'corp_code': '00888888', 'corp_name': '전진건설', 'stock_code': '', 'modify_date': '20240101'},
+]
+
+
+@pytest.fixture(scope='module', autouse=True)
+def company_db(tmp_path_factory):
+    # create_database/search_companies는 현재 디렉터리의 corp_codes.json/corp_codes.db를 사용
+    directory = tmp_path_factory.mktemp('companies')
+    (directory / 'corp_codes.json').write_text(json.dumps(COMPANIES, ensure_ascii=False), encoding='utf-8')
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(directory)
+        create_database()
+        yield directory
+
+
+def names(query, limit=10):
+    return [company['corp_name'] for company in search_companies(query, limit)]
+
+
+def test_trigram_search_matches_anywhere_in_name():
+    assert names('자동차') == ['현대자동차']
+    assert names('성전자') == ['삼성전자', '삼성전자서비스']
+
+
+def test_bigram_search_matches_two_character_queries():
+    assert names('전자') == ['LG전자', '삼성전자', '삼성전자서비스']
+    assert names('전력') == ['한국전력공사']
+
+
+def test_exact_match_ranks_first_then_listed_companies():
+    assert names('삼성전자서비스')[0] == '삼성전자서비스'
+    assert names('삼성') == ['삼성물산', '삼성전자', '삼성전자서비스']
+
+
+def test_single_character_query():
+    assert names('현') == ['현대자동차']
+
+
+def test_single_character_query_adds_substring_matches_after_prefix_matches():
+    # 접두어 일치(비상장) > 부분 일치(상장사 우선)
+    assert names('전') == ['전진건설', 'LG전자', '삼성전자', '한국전력공사', '삼성전자서비스']
+    assert names('삼', limit=2) == ['삼성물산', '삼성전자']
+    assert names('G') == ['LG전자']
+    assert names('g') == ['LG전자']
+
+
+def test_limit_and_no_match():
+    assert len(names('삼성', limit=2)) == 2
+    assert names('카카오') == []
+
+
+def test_chosung_search():
+    assert names('ㅅㅅㅈㅈ') == ['삼성전자', '삼성전자서비스']
+    assert names('ㅎㄷ') == ['현대자동차']
+
+
+def test_latin_search_matches_romanized_names():
+    assert names('samsung')[:2] == ['삼성물산', '삼성전자']
+    assert names('hyundai') == ['현대자동차']
+    assert names('lg') == ['LG전자']
+
+
+def test_stock_code_and_corp_code_search():
+    assert names('005930') == ['삼성전자']
+    assert names('0053') == ['현대자동차']
+    assert names('00126371') == ['삼성물산']
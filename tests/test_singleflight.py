@@ -0,0 +1,91 @@
+import time
+import threading
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, fn, callers):
+    results = [None] * callers
+    errors = [None] * callers
+
+    def call(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight('test')
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    leader, results, _ = run_concurrently(flight, 'key', fetch, 1)
+    assert started.wait(5)
+    followers, follower_results, _ = run_concurrently(flight, 'key', fetch, 4)
+
+    # 모든 요청이 기다리기 시작한 뒤에 실행을 끝냄
+    while flight.stats()['shared'] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results + follower_results == ['result'] * 5
+    assert flight.stats() == {'executed': 1, 'shared': 4, 'in_flight': 0}
+
+
+def test_error_is_shared_and_key_is_cleared():
+    flight = SingleFlight('test')
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError('upstream down')
+
+    leader, _, errors = run_concurrently(flight, 'key', fail, 1)
+    assert started.wait(5)
+    followers, _, follower_errors = run_concurrently(flight, 'key', fail, 2)
+    while flight.stats()['shared'] < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert all(isinstance(error, ValueError) for error in errors + follower_errors)
+
+    # 실패한 결과는 보관하지 않으므로 다음 호출은 다시 실행
+    assert flight.do('key', lambda: 'retry') == 'retry'
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight('test')
+
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.stats() == {'executed': 2, 'shared': 0, 'in_flight': 0}
+
+
+def test_arguments_are_passed_through():
+    flight = SingleFlight('test')
+
+    assert flight.do('key', lambda x, y=0: x + y, 1, y=2) == 3
+    with pytest.raises(KeyError):
+        flight.do('key', lambda: {}['missing'])